@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Save and load time of todos.json: indented versus compact, json versus orjson
+
+Each variant is measured in its own interpreter, since the codec is
+picked once per process:
+
+    python benchmarks/bench_json_codec.py [COUNT]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+COUNT = 100_000
+REPEAT = 5
+STATUSES = ("pending", "done", "on-hold")
+FOCUSES = ("default", "work", "home", "errands")
+
+# name: (GHOSTY_JSON, indented) - indented is how todos.json used to be written
+VARIANTS = {
+    "indented json": ("json", True),
+    "compact json": ("json", False),
+    "compact orjson": ("", False),
+}
+
+
+def make_todos(count):
+    start = 1_700_000_000
+    return [{
+        "id": os.urandom(8).hex(),
+        "text": f"todo number {i} for the benchmark – with ünïcode",
+        "status": STATUSES[i % 3],
+        "focus": FOCUSES[i % 4],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(start + i)),
+        "created_ts": start + i,
+    } for i in range(count)]
+
+
+def measure(source, path, indented):
+    """Print the best save and load seconds and the file size as JSON"""
+    import ghosty
+    with open(source, encoding="utf-8") as f:
+        todos = ghosty.as_todos(json.load(f))
+
+    def save():
+        if indented:
+            data = json.dumps(todos, ensure_ascii=False, indent=2, default=ghosty.todo_json)
+        else:
+            data = ghosty.encode_todos(todos)
+        ghosty.atomic_write(path, data)
+
+    def load():
+        if indented:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        with open(path, "rb") as f:
+            return ghosty.loads_json(f.read())
+
+    times = {}
+    for name, call in (("save", save), ("load", load)):
+        best = None
+        for _ in range(REPEAT):
+            began = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - began
+            best = elapsed if best is None else min(best, elapsed)
+        times[name] = best
+    assert len(load()) == len(todos)
+    print(json.dumps({"codec": ghosty.json_codec(), "size": os.path.getsize(path), **times}))
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3], sys.argv[4] == "indented")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(make_todos(count), f)
+        for name, (codec, indented) in VARIANTS.items():
+            env = dict(os.environ, GHOSTY_JSON=codec)
+            out = subprocess.run([sys.executable, __file__, "--measure", source,
+                                  os.path.join(tmp, "todos.json"), "indented" if indented else "compact"],
+                                 env=env, check=True, stdout=subprocess.PIPE).stdout
+            results[name] = json.loads(out)
+    print(f"{count:,} todos")
+    base = results["indented json"]
+    for name, r in results.items():
+        if name != "indented json" and r["codec"] != name.split()[-1]:
+            print(f"{name:15} skipped ({name.split()[-1]} is not installed)")
+            continue
+        print(f"{name:15} save {r['save'] * 1000:7.1f} ms  load {r['load'] * 1000:7.1f} ms"
+              f"  {r['size'] / 2**20:6.1f} MiB  ({base['save'] / r['save']:.1f}x save,"
+              f" {base['load'] / r['load']:.1f}x load)")
+
+
+if __name__ == "__main__":
+    main()
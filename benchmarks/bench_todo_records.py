@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Resident memory and load time of todos as dicts versus Todo records
+
+dicts are what load_todos() hands out, records what the resident store
+of `ghosty daemon` keeps. Each is measured in its own interpreter so
+neither sees the other's heap:
+
+    python benchmarks/bench_todo_records.py [COUNT]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+COUNT = 1_000_000
+STATUSES = ("pending", "done", "on-hold")
+FOCUSES = ("default", "work", "home", "errands")
+
+
+def write_store(path, count):
+    """A todos.json with count todos in the ghosty layout"""
+    start = 1_700_000_000
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(count):
+            todo = {
+                "id": os.urandom(8).hex(),
+                "text": f"todo number {i} for the benchmark",
+                "status": STATUSES[i % 3],
+                "focus": FOCUSES[i % 4],
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(start + i)),
+                "created_ts": start + i,
+            }
+            f.write(("," if i else "") + json.dumps(todo, ensure_ascii=False) + "\n")
+        f.write("]\n")
+
+
+def load(path, kind):
+    """The store as a list of dicts or of Todo records"""
+    import ghosty
+    with open(path, "rb") as f, ghosty.gc_paused():
+        todos = ghosty.loads_json(f.read())
+    if kind == "records":
+        todos = ghosty.as_todos(todos)
+    return todos
+
+
+def measure(path, kind):
+    """Print load seconds, peak RSS and the bytes the loaded list holds
+
+    tracemalloc slows allocation down, so the list is loaded twice: once
+    timed and once traced.
+    """
+    import ghosty  # Not part of the load time
+    began = time.perf_counter()
+    todos = load(path, kind)
+    elapsed = time.perf_counter() - began
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    del todos
+    tracemalloc.start()
+    todos = load(path, kind)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"kind": kind, "todos": len(todos), "seconds": elapsed,
+                      "held": held, "max_rss": rss}))
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3])
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "todos.json")
+        write_store(path, count)
+        print(f"{count:,} todos, {os.path.getsize(path) / 2**20:.0f} MiB of JSON")
+        results = {}
+        for kind in ("dicts", "records"):
+            out = subprocess.run([sys.executable, __file__, "--measure", path, kind],
+                                 check=True, stdout=subprocess.PIPE).stdout
+            results[kind] = json.loads(out)
+    for kind, r in results.items():
+        print(f"{kind:8} load {r['seconds']:6.2f}s  held {r['held'] / 2**20:7.1f} MiB"
+              f"  max rss {r['max_rss'] / 2**20:7.1f} MiB")
+    saved = 1 - results["records"]["held"] / results["dicts"]["held"]
+    print(f"records hold {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
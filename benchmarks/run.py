@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Ghosty benchmark suite
+
+Generates synthetic stores of 1k, 10k, 100k and 1M todos spread over
+many focuses and times cold-start CLI commands plus the storage,
+backup, parsing and rendering functions behind them. Everything runs
+offline in a throwaway portable copy of Ghosty, with output going to
+a pipe, and the results are saved as JSON in benchmarks/results/, which
+git ignores:
+
+    python benchmarks/run.py                          # every size, into latest.json
+    python benchmarks/run.py --sizes 1k 10k -o benchmarks/results/new.json
+    python benchmarks/run.py --baseline benchmarks/results/old.json  # exit 1 on regressions
+"""
+
+import argparse
+import json
+import os
+import platform
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO / "benchmarks" / "results"
+SIZES = ("1k", "10k", "100k", "1M")
+FOCUS_SIZE = 500  # Todos per focus; the stores get count // FOCUS_SIZE focuses
+STATUSES = ("pending", "pending", "done", "on-hold")
+START_TS = 1_700_000_000
+
+# Cold-start commands: argv after `ghosty`, or a python snippet for what
+# has no CLI command. {i} is the repeat number, so each run of drop_focus
+# deletes a different focus. Commands run `python ghosty.py`, whose
+# application module loads from cached bytecode; the compile case times
+# what compiling it would cost on its own.
+CLI_CASES = {
+    "cli.list": ["list"],
+    "cli.add": ["add", "benchmark todo {i}"],
+    "cli.check": ["check", "1-100"],
+    "cli.remove": ["remove", "1-10"],
+    "cli.drop_focus": [sys.executable, "-c", "import ghosty; ghosty.drop_focus('focus-{focus}')"],
+}
+
+# In-process cases, timed inside one interpreter after a setup step
+INNER_CASES = ("compile", "save_todos", "backup_data", "parse_numbers", "render.banner",
+               "render.list", "display_todo_list")
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1M' -> 1000000"""
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(text.rstrip("kKmM")) * scale
+
+
+def focus_name(n):
+    return f"focus-{n:04d}"
+
+
+def make_store(app_dir, count, engine):
+    """Portable ghosty copy in app_dir with count todos, return focus count"""
+    app_dir.mkdir(parents=True)
+    for name in ("ghosty.py", "ghosty_app.py"):
+        shutil.copy2(REPO / name, app_dir / name)
+        py_compile.compile(str(app_dir / name), doraise=True)  # As an installed copy would be
+    (app_dir / "portable.txt").write_text("")
+    data_dir = app_dir / ".ghosty_data"
+    data_dir.mkdir()
+    focuses = max(10, count // FOCUS_SIZE)
+    with open(data_dir / "todos.json", "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(count):
+            ts = START_TS + i * 37
+            todo = {"id": f"{i:016x}", "text": f"synthetic todo {i} with a few words to search",
+                    "status": STATUSES[i % len(STATUSES)], "focus": focus_name(i % focuses),
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)), "created_ts": ts}
+            f.write(("," if i else "") + json.dumps(todo) + "\n")
+        f.write("]\n")
+    config = {"current_focus": focus_name(0), "focuses": [focus_name(n) for n in range(focuses)],
+              "theme": "Ghosty Classic", "storage": "json"}
+    (data_dir / "config.json").write_text(json.dumps(config, indent=2))
+    if engine != "json":
+        snippet = f"import ghosty; ghosty.switch_storage(ghosty.load_config(), {engine!r})"
+        subprocess.run([sys.executable, "-c", snippet], cwd=app_dir, env=bench_env(), check=True)
+    return focuses
+
+
+def bench_env():
+    """A fixed terminal size, so every run renders the same frame"""
+    env = dict(os.environ, COLUMNS="80", LINES="40")
+    env.pop("GHOSTY_TRACE", None)
+    return env
+
+
+def summarize(times):
+    return {"min": min(times), "median": statistics.median(times), "runs": times}
+
+
+def time_cli(app_dir, argv, repeat, focuses):
+    """Wall time of each cold run of a command, stdout into a pipe"""
+    times = []
+    for i in range(repeat):
+        if argv[0] == sys.executable:
+            command = [arg.format(focus=f"{1 + i % (focuses - 1):04d}") for arg in argv]
+        else:
+            command = [sys.executable, "ghosty.py"] + [arg.format(i=i) for arg in argv]
+        began = time.perf_counter()
+        result = subprocess.run(command, cwd=app_dir, env=bench_env(),
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        times.append(time.perf_counter() - began)
+        if result.returncode:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr.decode(errors='replace')}")
+    return summarize(times)
+
+
+def time_inner(app_dir, case, repeat):
+    """Times of an in-process case, run in a child whose stdout is a pipe"""
+    command = [sys.executable, str(Path(__file__).resolve()), "--inner", case, str(repeat)]
+    result = subprocess.run(command, cwd=app_dir, env=bench_env(),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode:
+        raise RuntimeError(f"{case} failed:\n{result.stderr.decode(errors='replace')}")
+    return summarize(json.loads(result.stderr.decode().splitlines()[-1]))
+
+
+def run_inner(case, repeat):
+    """Child side of time_inner: report the times on stderr as JSON"""
+    sys.path.insert(0, os.getcwd())
+    import ghosty
+    todos = ghosty.load_todos()
+    focus = ghosty.load_config()["current_focus"]
+    rows = list(enumerate(ghosty.load_todos(focus), 1))
+    counts = ghosty.status_counts([todo for _, todo in rows])
+    source = Path(ghosty.__file__).read_text(encoding="utf-8")
+    calls = {
+        "compile": lambda: compile(source, "ghosty_app.py", "exec"),
+        "save_todos": lambda: ghosty.save_todos(todos),
+        "backup_data": lambda: ghosty.backup_data(force=True),
+        "parse_numbers": lambda: ghosty.parse_numbers("1-50 75 100-400/3 900- -5-"),
+        "render.banner": lambda: ghosty.render_banner("Ghosty Classic", False, 56),
+        "render.list": lambda: sys.stdout.write(
+            ''.join(line + '\n' for line in ghosty.todo_list_frame(rows, focus, counts, False))),
+        "display_todo_list": lambda: ghosty.display_todo_list(show_banner=False),
+    }
+    call = calls[case]
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        call()
+        sys.stdout.flush()
+        times.append(time.perf_counter() - began)
+    sys.stderr.write(json.dumps(times) + "\n")
+
+
+def run_suite(sizes, engine, repeat, cases):
+    results = {}
+    for label in sizes:
+        count = parse_size(label)
+        with tempfile.TemporaryDirectory(prefix="ghosty-bench-") as tmp:
+            app_dir = Path(tmp) / "app"
+            began = time.perf_counter()
+            focuses = make_store(app_dir, count, engine)
+            print(f"{label:>5}: {count:,} todos in {focuses} focuses "
+                  f"(generated in {time.perf_counter() - began:.1f}s)", file=sys.stderr)
+            results[label] = {}
+            for case in cases:
+                if case in CLI_CASES:
+                    result = time_cli(app_dir, CLI_CASES[case], repeat, focuses)
+                else:
+                    result = time_inner(app_dir, case, repeat)
+                results[label][case] = result
+                print(f"       {case:<20} {result['min'] * 1000:9.2f} ms  (median {result['median'] * 1000:.2f})",
+                      file=sys.stderr)
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return out.stdout.decode().strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Print current against baseline times, return the regressions
+
+    The fastest run is compared: the slower ones mostly measure whatever
+    else the machine was doing.
+    """
+    regressions = []
+    print(f"{'size':>5}  {'case':<20} {'baseline':>11} {'current':>11} {'change':>8}")
+    for label, cases in results.items():
+        for case, result in cases.items():
+            old = baseline.get("results", {}).get(label, {}).get(case)
+            if not old:
+                continue
+            change = result["min"] / old["min"] - 1
+            flag = ""
+            if change > tolerance:
+                regressions.append((label, case, change))
+                flag = "  slower"
+            print(f"{label:>5}  {case:<20} {old['min'] * 1000:9.2f}ms {result['min'] * 1000:9.2f}ms"
+                  f" {change:+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--inner":
+        run_inner(sys.argv[2], int(sys.argv[3]))
+        return 0
+    parser = argparse.ArgumentParser(description="Ghosty benchmark suite")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), metavar="N",
+                        help="store sizes, e.g. 1k 10k 100k 1M (default: all four)")
+    parser.add_argument("--engine", default="json", choices=["json", "journal", "sharded", "sqlite", "packed"],
+                        help="storage engine of the generated stores (default: json)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (default: 5)")
+    parser.add_argument("--cases", nargs="+", choices=list(CLI_CASES) + list(INNER_CASES),
+                        default=list(CLI_CASES) + list(INNER_CASES), help="only run these cases")
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS_DIR / "latest.json",
+                        help="where to save the results (default: benchmarks/results/latest.json)")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="slowdown counted as a regression (default: 0.25)")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.engine, args.repeat, args.cases)
+    report = {
+        "meta": {"revision": git_revision(), "engine": args.engine, "repeat": args.repeat,
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4219 @@
+#!/usr/bin/env python3
+"""
+Ghosty Todo - A minimalist todo list manager
+By AK
+"""
+import time
+START_TIME = time.perf_counter()  # Reference point for --timings
+START_CPU = time.process_time()  # Spent by the interpreter before this line
+import os
+import re
+import sys
+import gc
+import json
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from collections.abc import MutableMapping
+# argparse, csv, datetime, hashlib, zlib, sqlite3, mmap, struct, socket and
+# the optional orjson are imported by the functions that need them - most
+# commands never do
+IMPORTS_DONE = time.perf_counter()
+IMPORTED_AT_START = set(sys.modules)
+
+
+# Constants
+
+RESPONSE_DURATION = 0.5  # How long response messages stay on the status line
+
+
+# Theme System
+
+THEMES = {
+    "Ghosty Classic": {
+        "name": "Ghosty Classic",
+        "colors": {
+            "light_grey": (180, 180, 190),
+            "dark_grey": (120, 120, 130),
+            "white": (245, 245, 245),
+            "ghost_purple": (140, 120, 170),
+            "haunted_green": (140, 200, 170),
+            "shadow_blue": (120, 160, 200),
+            "yellow": (230, 200, 120),
+            "red": (220, 80, 80),
+            "cyan_faint": (150, 220, 220),
+            "banner_start": (110, 110, 115),
+            "banner_end": (240, 240, 245)
+        }
+    },
+    "Dracula": {
+        "name": "Dracula",
+        "colors": {
+            "light_grey": (189, 147, 249),  # Purple
+            "dark_grey": (139, 233, 253),   # Cyan
+            "white": (248, 248, 242),       # Foreground
+            "ghost_purple": (189, 147, 249), # Purple
+            "haunted_green": (80, 250, 123), # Green
+            "shadow_blue": (139, 233, 253),  # Cyan
+            "yellow": (241, 250, 140),      # Yellow
+            "red": (255, 85, 85),           # Red
+            "cyan_faint": (139, 233, 253),  # Cyan
+            "banner_start": (68, 71, 90),   # Dracula Background
+            "banner_end": (189, 147, 249)   # Dracula Purple
+        }
+    },
+    "Tokyo Dark": {
+        "name": "Tokyo Dark",
+        "colors": {
+            "light_grey": (148, 162, 199),  # Purple
+            "dark_grey": (105, 118, 155),   # Cyan
+            "white": (141, 152, 182),       # Foreground
+            "ghost_purple": (255, 204, 100), # Purple
+            "haunted_green": (126, 193, 95), # Green
+            "shadow_blue": (113, 90, 255),  # Cyan
+            "yellow": (107, 72, 153),      # Yellow
+            "red": (255, 72, 65),           # Red
+            "cyan_faint": (86, 93, 139),  # Cyan
+            "banner_start": (169, 175, 214),   # Dracula Background
+            "banner_end": (107, 116, 182)   # Dracula Purple
+        }        
+    },
+    "Space Dark": {
+        "name": "Space Dark",
+        "colors": {
+            "light_grey": (148, 162, 199),  # Purple
+            "dark_grey": (105, 118, 155),   # Cyan
+            "white": (248, 227, 201),       # Foreground
+            "ghost_purple": (244, 167, 110), # Purple
+            "haunted_green": (227, 45, 104), # Green
+            "shadow_blue": (192, 71, 142),  # Cyan
+            "yellow": (119, 92, 146),      # Yellow
+            "red": (207, 32, 42),           # Red
+            "cyan_faint": (226, 82, 81),  # Cyan
+            "banner_start": (33, 55, 119),   # Dracula Background
+            "banner_end": (189, 45, 65)   # Dracula Purple
+        }        
+    },
+}
+
+class G:
+    END = '\033[0m'
+    BOLD = '\033[1m'
+    
+    # These will be set by the theme
+    LIGHT_GREY = ''
+    DARK_GREY = ''
+    WHITE = ''
+    GHOST_PURPLE = ''
+    HAUNTED_GREEN = ''
+    SHADOW_BLUE = ''
+    YELLOW = ''
+    RED = ''
+    CYAN_FAINT = ''
+    PLAIN = False  # Machine output: never build theme escape codes
+
+def load_theme(theme_name="Ghosty Classic"):
+    """Load a theme by name"""
+    theme = THEMES.get(theme_name, THEMES["Ghosty Classic"])
+    colors = theme["colors"]
+    
+    G.LIGHT_GREY = f'\033[38;2;{colors["light_grey"][0]};{colors["light_grey"][1]};{colors["light_grey"][2]}m'
+    G.DARK_GREY = f'\033[38;2;{colors["dark_grey"][0]};{colors["dark_grey"][1]};{colors["dark_grey"][2]}m'
+    G.WHITE = f'\033[38;2;{colors["white"][0]};{colors["white"][1]};{colors["white"][2]}m'
+    G.GHOST_PURPLE = f'\033[38;2;{colors["ghost_purple"][0]};{colors["ghost_purple"][1]};{colors["ghost_purple"][2]}m'
+    G.HAUNTED_GREEN = f'\033[38;2;{colors["haunted_green"][0]};{colors["haunted_green"][1]};{colors["haunted_green"][2]}m'
+    G.SHADOW_BLUE = f'\033[38;2;{colors["shadow_blue"][0]};{colors["shadow_blue"][1]};{colors["shadow_blue"][2]}m'
+    G.YELLOW = f'\033[38;2;{colors["yellow"][0]};{colors["yellow"][1]};{colors["yellow"][2]}m'
+    G.RED = f'\033[38;2;{colors["red"][0]};{colors["red"][1]};{colors["red"][2]}m'
+    G.CYAN_FAINT = f'\033[38;2;{colors["cyan_faint"][0]};{colors["cyan_faint"][1]};{colors["cyan_faint"][2]}m'
+    
+    return colors
+
+THEME_CODES = ('LIGHT_GREY', 'DARK_GREY', 'WHITE', 'GHOST_PURPLE', 'HAUNTED_GREEN',
+               'SHADOW_BLUE', 'YELLOW', 'RED', 'CYAN_FAINT')
+
+def use_plain_output(plain=True):
+    """Strip every escape code from G and stop themes from loading
+
+    use_plain_output(False) brings the codes back; the theme itself is
+    loaded again by the next load_config(). The daemon switches per request.
+    """
+    global _applied_theme
+    G.PLAIN = plain
+    if plain:
+        G.END = G.BOLD = ''
+        for name in THEME_CODES:
+            setattr(G, name, '')
+    else:
+        G.END, G.BOLD = '\033[0m', '\033[1m'
+    _applied_theme = None
+
+def terminal_state():
+    """What decides between colour and plain output; sent along to the daemon"""
+    return {"tty": sys.stdout.isatty(), "no_color": bool(os.environ.get("NO_COLOR"))}
+
+def wants_plain_output(mode, state):
+    """Nothing to colour for scripts, pipes and NO_COLOR (https://no-color.org)"""
+    return bool(mode) or not state.get("tty") or bool(state.get("no_color"))
+
+
+# UI / Color helpers
+
+def set_terminal_title(title: str):
+    if not sys.stdout.isatty():
+        return  # Keep piped output (e.g. ghosty export) free of escape codes
+    try:
+        if os.name == 'nt':
+            os.system(f'title {title}')
+        else:
+            sys.stdout.write(f"\33]0;{title}\a")
+            sys.stdout.flush()
+    except Exception:
+        pass
+
+def clear():
+    """Clear the terminal and forget the last frame (see Screen Renderer)"""
+    sys.stdout.write("\033[H\033[2J")
+    sys.stdout.flush()
+    _screen["frame"] = None
+
+def gradient_text(text, start_rgb, end_rgb, steps=None):
+    """Colour each line of text with a left-to-right gradient
+
+    An escape code is only emitted where the colour changes, and spaces
+    keep whatever colour is active. With steps, each line uses at most
+    that many colours, so neighbouring characters share one escape.
+    """
+    lines = text.splitlines()
+    out_lines = []
+    for line in lines:
+        length = max(1, len(line))
+        parts = []
+        current = None
+        for i, ch in enumerate(line):
+            if ch == ' ':
+                parts.append(ch)
+                continue
+            t = i / (length - 1) if length > 1 else 0
+            if steps:
+                t = int(t * steps) / steps if t < 1 else 1
+            r = int(start_rgb[0] + (end_rgb[0] - start_rgb[0]) * t)
+            g = int(start_rgb[1] + (end_rgb[1] - start_rgb[1]) * t)
+            b = int(start_rgb[2] + (end_rgb[2] - start_rgb[2]) * t)
+            if (r, g, b) != current:
+                parts.append(f"\033[38;2;{r};{g};{b}m")
+                current = (r, g, b)
+            parts.append(ch)
+        out_lines.append(''.join(parts) + G.END)
+    return '\n'.join(out_lines)
+
+def clear_line():
+    """Clear the current line"""
+    print("\033[K", end="")
+
+def move_cursor_up(lines=1):
+    """Move cursor up specified number of lines"""
+    print(f"\033[{lines}F", end="")
+
+# Status Line
+# Response messages are queued and drawn just above the next prompt, then
+# erased by a timer thread so the prompt never waits on them.
+
+_status = {"lines": []}
+
+def post_status(message, color):
+    """Queue a transient message for the next prompt"""
+    _status["lines"].append(f"{color}{message}{G.END}")
+
+def _erase_status(count):
+    """Blank the status lines above the prompt, keeping the cursor where it is"""
+    out = "\0337" + f"\033[{count}A"
+    out += "\033[1B".join("\r\033[2K" for _ in range(count))
+    sys.stdout.write(out + "\0338")
+    sys.stdout.flush()
+
+def status_input(prompt):
+    """Print queued status messages, then read input without waiting on them"""
+    end_frame()
+    lines, _status["lines"] = _status["lines"], []
+    timer = None
+    if lines:
+        print('\n'.join(lines))
+        if sys.stdout.isatty():
+            timer = threading.Timer(RESPONSE_DURATION, _erase_status, (len(lines),))
+            timer.daemon = True
+            timer.start()
+    try:
+        return input(prompt)
+    finally:
+        if timer:
+            timer.cancel()
+
+def show_error(message):
+    """Display error message on the status line"""
+    post_status(message, G.RED)
+
+def show_success(message, force_show=False):
+    """Display success message if enabled in config"""
+    config = load_config()
+    if config.get("show_responses", True) or force_show:
+        post_status(message, G.HAUNTED_GREEN)
+
+def show_batch_summary(counts, invalid=()):
+    """Post one status line for a batch command instead of one per todo
+
+    counts is a list of (label, number) pairs; zero counts are left out.
+    """
+    if invalid:
+        show_error(f"✖ Invalid todo number(s): {', '.join(str(n) for n in invalid)}")
+    parts = [f"{number} {label}" for label, number in counts if number]
+    if parts:
+        show_success(f"✔ {', '.join(parts)}")
+
+# Output Writer
+# main() replaces sys.stdout with an OutputWriter that collects everything
+# printed and hands it over in one write per flush - a prompt, a redrawn
+# frame or the end of the run - instead of one write per line. When
+# stdout is not a terminal, escape codes are stripped, so piping
+# `ghosty list` into a file or grep gives plain text.
+
+OUTPUT_CHUNK_CHARS = 64 * 1024  # Write out early once this much piles up
+
+_output = {"writer": None}
+# CSI, OSC and cursor save/restore sequences - all ghosty ever prints
+_ANSI_ESCAPE = re.compile(r'\033(?:\[[0-9;?]*[A-Za-z]|\][^\a\033]*(?:\a|\033\\)|[78])')
+
+def strip_escapes(text):
+    """text without escape sequences"""
+    return _ANSI_ESCAPE.sub('', text)
+
+def silence_stream(stream):
+    """Point stream's descriptor at devnull, e.g. once its reader went away"""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, stream.fileno())
+    finally:
+        os.close(devnull)
+
+class OutputWriter:
+    """Buffering stand-in for sys.stdout, written out on flush()"""
+    def __init__(self, stream):
+        self.stream = stream
+        self.tty = stream.isatty()
+        self.strip = not self.tty
+        self.parts = []
+        self.size = 0
+        self.gone = False  # The reader went away
+        self.lock = threading.Lock()  # The status line timer writes too
+
+    def write(self, text):
+        if self.gone:
+            return len(text)
+        if self.strip and '\033' in text:
+            text = strip_escapes(text)
+        with self.lock:
+            self.parts.append(text)
+            self.size += len(text)
+        if self.size >= OUTPUT_CHUNK_CHARS:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            text = ''.join(self.parts)
+            self.parts, self.size = [], 0
+        if self.gone:
+            return
+        try:
+            if text:
+                self.stream.write(text)
+            self.stream.flush()
+        except BrokenPipeError:
+            # Reader went away (e.g. | head): drop the rest, and point the
+            # descriptor at devnull so the interpreter's own final flush
+            # does not fail either
+            self.gone = True
+            silence_stream(self.stream)
+
+    def isatty(self):
+        return self.tty
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def use_output_writer():
+    """Route sys.stdout through an OutputWriter until the process exits"""
+    import atexit
+    _output["writer"] = sys.stdout = OutputWriter(sys.stdout)
+    atexit.register(drain_output)
+
+def raw_output():
+    """Leave escape codes in, e.g. inside todo text in exports and records"""
+    if _output["writer"]:
+        _output["writer"].strip = False
+
+def drain_output():
+    """Write out whatever is still buffered"""
+    if _output["writer"] is not None:
+        _output["writer"].flush()
+
+# Screen Renderer
+# Menus draw between begin_frame() and their status_input() prompt. The
+# captured lines are compared with the previous frame and only the rows
+# that changed are rewritten with cursor addressing - no `clear` process,
+# no flicker. Anything below the frame (prompt, status lines, sub-prompts)
+# is wiped with one clear-to-end-of-screen.
+
+_screen = {"frame": None, "size": None, "capture": None, "stdout": None}
+
+def visible_width(line):
+    """Length of line as displayed, escape codes excluded"""
+    return len(strip_escapes(line))
+
+def begin_frame():
+    """Capture what a menu prints as the next frame"""
+    import io
+    end_frame()
+    _screen["stdout"] = sys.stdout
+    _screen["capture"] = sys.stdout = io.StringIO()
+
+def end_frame():
+    """Stop capturing and draw the captured frame, if any"""
+    capture = _screen["capture"]
+    if capture is None:
+        return
+    sys.stdout = _screen["stdout"]
+    _screen["capture"] = None
+    draw_frame(capture.getvalue().split('\n')[:-1])
+
+def draw_frame(lines):
+    """Show lines as the whole screen, rewriting only changed rows
+
+    Falls back to a full repaint when there is no previous frame, the
+    terminal was resized, or the frame would scroll or wrap - cursor
+    addressing is only exact while every row stays where it was drawn.
+    """
+    out = sys.stdout
+    if not out.isatty():
+        out.write(''.join(line + '\n' for line in lines))
+        return
+    try:
+        size = os.get_terminal_size(out.fileno())
+    except (OSError, ValueError):
+        size = None
+    previous = _screen["frame"]
+    fits = (size is not None and len(lines) + 6 <= size.lines
+            and all(visible_width(line) < size.columns for line in lines))
+    if previous is None or not fits or size != _screen["size"]:
+        out.write("\033[H\033[2J" + ''.join(line + '\n' for line in lines))
+    else:
+        parts = [f"\033[{row + 1};1H{line}\033[K"
+                 for row, line in enumerate(lines)
+                 if row >= len(previous) or previous[row] != line]
+        parts.append(f"\033[{len(lines) + 1};1H\033[J")
+        out.write(''.join(parts))
+    out.flush()
+    _screen["frame"] = lines if fits else None
+    _screen["size"] = size
+
+# Alternate banner - ASCII empty
+ALTERNATE_BANNER = r"""
+
+"""
+
+BANNER = r"""
+   ██████╗ ██╗  ██╗ ██████╗ ███████╗████████╗██╗   ██╗
+  ██╔════╝ ██║  ██║██╔═══██╗██╔════╝╚══██╔══╝╚██╗ ██╔╝
+  ██║  ███╗███████║██║   ██║███████╗   ██║    ╚████╔╝ 
+  ██║   ██║██╔══██║██║   ██║╚════██║   ██║     ╚██╔╝  
+  ╚██████╔╝██║  ██║╚██████╔╝███████║   ██║      ██║   
+   ╚═════╝ ╚═╝  ╚═╝ ╚═════╝ ╚══════╝   ╚═╝      ╚═╝   
+"""
+
+def center_text(text, width=56):
+    return text.center(width)
+
+# Rendered banners by (theme, colours, variant, width, banner text), kept
+# in memory and in banner_cache.json so a redraw is a single write
+BANNER_GRADIENT_STEPS = 16
+BANNER_CACHE_ENTRIES = 8
+_banner_cache = {}
+
+def _banner_cache_file():
+    return DATA_DIR / "banner_cache.json"
+
+def terminal_width():
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return 80
+
+def render_banner(theme_name, use_alternate, width):
+    """Banner plus tagline lines, colourised and cropped to width"""
+    colors = THEMES.get(theme_name, THEMES["Ghosty Classic"])["colors"]
+    banner_text = ALTERNATE_BANNER if use_alternate else BANNER
+    banner_text = '\n'.join(line[:width] for line in banner_text.split('\n'))
+    lines = [
+        gradient_text(banner_text, colors["banner_start"], colors["banner_end"], BANNER_GRADIENT_STEPS),
+        f"{G.GHOST_PURPLE}{G.BOLD}{center_text('[ Ghosty - The ghost in your machine ]', 56)[:width]}{G.END}",
+        f"{G.SHADOW_BLUE}{center_text('[ Made with love - By AK ]', 56)[:width]}{G.END}",
+    ]
+    return '\n'.join(lines) + '\n'
+
+def banner_key(theme_name, use_alternate, width):
+    """Cache key covering everything a rendered banner depends on"""
+    import zlib
+    colors = THEMES.get(theme_name, THEMES["Ghosty Classic"])["colors"]
+    banner_text = ALTERNATE_BANNER if use_alternate else BANNER
+    source = json.dumps([sorted(colors.items()), banner_text, BANNER_GRADIENT_STEPS, G.END])
+    return f"{theme_name}|{int(use_alternate)}|{width}|{zlib.crc32(source.encode('utf-8')):08x}"
+
+def cached_banner(theme_name, use_alternate, width):
+    """Rendered banner from memory, banner_cache.json or a fresh render"""
+    width = min(width, 56)  # Wider terminals all get the same banner
+    key = banner_key(theme_name, use_alternate, width)
+    if key in _banner_cache:
+        return _banner_cache[key]
+    stored = _read_json(_banner_cache_file(), {})
+    if not isinstance(stored, dict):
+        stored = {}
+    banner = stored.get(key)
+    if not isinstance(banner, str):
+        banner = render_banner(theme_name, use_alternate, width)
+        stored.pop(key, None)
+        stored[key] = banner
+        for old_key in list(stored)[:-BANNER_CACHE_ENTRIES]:
+            del stored[old_key]
+        try:
+            ensure_data_dir()
+            _write_json(_banner_cache_file(), stored)
+        except OSError:
+            pass  # Only a cache
+    _banner_cache[key] = banner
+    return banner
+
+def print_banner():
+    sys.stdout.write(''.join(line + '\n' for line in banner_lines()))
+
+def banner_lines():
+    """The banner as screen lines, empty when hidden in the config"""
+    config = load_config()
+    if config.get("hide_banner", False):
+        return []
+    use_alternate = config.get("alternate_banner", False)
+    return cached_banner(config.get("theme", "Ghosty Classic"), use_alternate, terminal_width()).split('\n')[:-1]
+
+
+# Data Management
+
+def get_data_dir():
+    """Get data directory - portable if portable.txt exists in script dir"""
+    script_dir = Path(__file__).parent.absolute()
+    portable_marker = script_dir / "portable.txt"
+    
+    if portable_marker.exists():
+        # Portable mode: store data in script directory
+        return script_dir / ".ghosty_data"
+    else:
+        # Normal mode: store in user home directory
+        return Path.home() / ".ghosty_todo"
+
+DATA_DIR = get_data_dir()
+TODO_FILE = DATA_DIR / "todos.json"
+JOURNAL_FILE = DATA_DIR / "todos.journal"
+SHARD_DIR = DATA_DIR / "todos.d"
+TODO_DB = DATA_DIR / "todos.db"
+PACK_FILE = DATA_DIR / "todos.pack"
+CONFIG_FILE = DATA_DIR / "config.json"
+
+# Storage engines selectable from Preferences ("storage" config key)
+STORAGE_ENGINES = ["json", "journal", "sharded", "sqlite", "packed"]
+JOURNAL_COMPACT_BYTES = 256 * 1024  # Fold the journal into todos.json past this size
+
+def ensure_data_dir():
+    """Ensure data directory exists and portable marker if needed"""
+    # Re-check in case DATA_DIR wasn't set yet
+    DATA_DIR = get_data_dir()
+    DATA_DIR.mkdir(exist_ok=True, parents=True)
+    return DATA_DIR
+
+class StorageError(Exception):
+    """Stored data exists but cannot be read safely"""
+
+def damaged_store(path, err):
+    """StorageError for a data file that no longer parses"""
+    return StorageError(f"{path} is damaged ({err}) - see 'ghosty backups' and 'ghosty restore'")
+
+@contextmanager
+def storage_write():
+    """Raise a failed write of the todos as a StorageError
+
+    Callers never report write failures themselves: the CLI (cli_error)
+    and the menus (show_error) report the StorageError.
+    """
+    try:
+        yield
+    except StorageError:
+        raise
+    except Exception as e:  # OSError, sqlite3.Error, ...
+        raise StorageError(f"Could not save todos: {e}") from e
+
+
+# File Safety
+#
+# Every read-modify-write of the data files runs under data_lock(), an
+# advisory lock on DATA_DIR/ghosty.lock shared by all ghosty processes,
+# and whole files are replaced atomically through atomic_write().
+
+_lock_state = {"lock": threading.RLock(), "depth": 0, "file": None}
+
+def _lock_file(f):
+    if os.name == 'nt':
+        import msvcrt
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ~10s - keep waiting
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+def _unlock_file(f):
+    if os.name == 'nt':
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+@contextmanager
+def data_lock():
+    """Hold the data directory lock; re-entrant within a thread"""
+    state = _lock_state
+    with state["lock"]:
+        if state["depth"] == 0:
+            ensure_data_dir()
+            state["file"] = open(DATA_DIR / "ghosty.lock", 'a+')
+            _lock_file(state["file"])
+        state["depth"] += 1
+        try:
+            yield
+        finally:
+            state["depth"] -= 1
+            if state["depth"] == 0:
+                _unlock_file(state["file"])
+                state["file"].close()
+                state["file"] = None
+
+def atomic_write(path, data):
+    """Replace path with data (str or bytes) via temp file, fsync and rename
+
+    Readers see either the old or the new contents, never a torn file.
+    """
+    path = Path(path)
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if isinstance(data, bytes):
+            f = open(tmp_file, 'wb')
+        else:
+            f = open(tmp_file, 'w', encoding='utf-8')
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(str(tmp_file), str(path))
+    except BaseException:
+        if tmp_file.exists():
+            tmp_file.unlink()
+        raise
+
+def file_stat(path):
+    """(mtime, size, inode) of path, None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+_todo_file_stat = None  # todos.json as this process last read or wrote it
+
+# The json and journal engines keep the parsed store between loads, keyed
+# by the stat of todos.json and the journal. Focus loads copy their todos
+# out of it and a commit applies its records to it, so one command - or
+# one pass of the todo list menu - parses the file at most once.
+_parsed = {"key": None, "todos": None}
+
+def _json_store_key():
+    return (file_stat(TODO_FILE), file_stat(JOURNAL_FILE))
+
+def storage_engine():
+    """Name of the configured storage engine"""
+    return load_config().get("storage", "json")
+
+# JSON Codec
+# todos.json, the shards, the journal and the search index are written as
+# compact JSON, the todo lists with one todo per line so backups still
+# chunk them on line boundaries. orjson is used when it is installed
+# (GHOSTY_JSON=json sticks to the json module); either reads what the
+# other wrote, and todos.json files from before still load. Importing
+# orjson takes longer than the json module needs for a small file, so it
+# is only imported once a megabyte of JSON comes along.
+
+ORJSON_MIN_BYTES = 1 << 20
+
+_codec = {"tried": False, "orjson": None, "encoder": None}
+
+def json_codec(size=ORJSON_MIN_BYTES):
+    """Name of the library used for size bytes of JSON: 'orjson' or 'json'
+
+    Once imported, orjson is used for everything.
+    """
+    if not _codec["tried"] and size >= ORJSON_MIN_BYTES:
+        _codec["tried"] = True
+        if os.environ.get("GHOSTY_JSON", "").lower() != "json":
+            try:
+                import orjson
+                _codec["orjson"] = orjson
+            except ImportError:
+                pass
+    return "orjson" if _codec["orjson"] is not None else "json"
+
+def _json_encoder():
+    """One encoder for every call - json.dumps builds a new one per call"""
+    if _codec["encoder"] is None:
+        _codec["encoder"] = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=todo_json)
+    return _codec["encoder"]
+
+def dumps_json(obj):
+    """obj as compact UTF-8 JSON bytes, Todos written as objects"""
+    if _codec["orjson"] is not None:
+        try:
+            return _codec["orjson"].dumps(obj, default=todo_json)
+        except TypeError:
+            pass  # Integers past 64 bits and the like - the json module copes
+    return _json_encoder().encode(obj).encode('utf-8')
+
+def loads_json(data):
+    """Parse JSON from bytes or str"""
+    if json_codec(len(data)) == "orjson":
+        return _codec["orjson"].loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')  # Quicker than json.loads sniffing the encoding
+    return json.loads(data)
+
+def encode_todos(todos):
+    """A todo list as JSON bytes, one todo per line"""
+    if not todos:
+        return b"[]\n"
+    records = [todo.to_dict() if type(todo) is Todo else todo for todo in todos]
+    if json_codec(len(records) * 150) == "orjson":  # About 150 bytes a todo
+        dumps = _codec["orjson"].dumps
+        try:
+            return b"[\n" + b",\n".join([dumps(record) for record in records]) + b"\n]\n"
+        except TypeError:
+            pass
+    # One encode call for the list, split into lines after: '},{"' can't
+    # occur inside a JSON string, only between objects
+    data = _json_encoder().encode(records)[1:-1].replace('},{"', '},\n{"')
+    return ("[\n" + data + "\n]\n").encode('utf-8')
+
+# Resident store
+# A long-running process (ghosty daemon) keeps every todo parsed in a
+# TodoIndex. It is revalidated against the stat of the storage files on
+# each load, so writes by other ghosty processes are always picked up.
+
+_resident = {"on": False, "signature": None, "index": None}
+
+def store_signature():
+    """Storage engine plus the stat of every file holding todos
+
+    todos.db and its WAL also change when SQLite checkpoints or closes,
+    so the sqlite engine is represented by the database inode and its
+    write counter (see db_generation) instead.
+    """
+    engine = storage_engine()
+    paths = [TODO_FILE, JOURNAL_FILE, PACK_FILE]
+    if SHARD_DIR.exists():
+        paths.extend(sorted(SHARD_DIR.glob("*.json")))
+    files = [(p.name, file_stat(p)) for p in paths]
+    if engine == "sqlite":
+        files.append((TODO_DB.name, ((file_stat(TODO_DB) or (0, 0, 0))[2], db_generation())))
+    return (engine, tuple(files))
+
+def keep_todos_resident():
+    """Serve load_todos() from memory from now on (see Resident store)"""
+    _resident["on"] = True
+
+def _resident_index():
+    signature = store_signature()
+    if signature != _resident["signature"]:
+        _resident["index"] = TodoIndex(as_todos(_read_todos()))
+        _resident["signature"] = store_signature()  # Reading may have migrated ids
+    return _resident["index"]
+
+def load_todos(focus=None):
+    """Load todos, or only those of one focus
+
+    The json and journal engines read todos.json and replay any pending
+    journal records; the sharded engine reads just the focus' shard and
+    the sqlite engine queries it through the focus index.
+    """
+    if _resident["on"]:
+        index = _resident_index()
+        todos = index.todos() if focus is None else index.focus(focus)
+        return [t.copy() for t in todos]  # Callers mutate what they load
+    return _read_todos(focus)
+
+def _read_todos(focus=None):
+    engine = storage_engine()
+    if engine == "sharded":
+        return load_shards(focus)
+    if engine == "sqlite":
+        return load_db(focus)
+    if engine == "packed":
+        return load_pack(focus)
+    todos = _take_parsed()
+    if focus is None:
+        return todos  # Handed over: the caller may change it
+    _parsed["todos"] = todos
+    return [t.copy() for t in todos if t.get('focus') == focus]
+
+def _take_parsed():
+    """The parsed store, taken out of _parsed - or parsed if that is stale"""
+    todos = _parsed.pop("todos", None)
+    if todos is None or _parsed["key"] != _json_store_key():
+        todos = _parse_todo_file()
+    return todos
+
+def _private_ops(ops):
+    """ops adding copies of their todos, so _parsed shares none with callers"""
+    return [dict(record, todo=dict(record['todo'])) if record.get('op') == 'add' else record
+            for record in ops]
+
+def _parse_todo_file():
+    """Parse todos.json and replay the journal, keying _parsed to them
+
+    The cyclic GC is paused while the parser makes a dict per todo.
+    """
+    global _todo_file_stat
+    todos = []
+    journal = file_stat(JOURNAL_FILE)  # Before reading, so appends meanwhile show as a change
+    stat = None
+    if TODO_FILE.exists():
+        try:
+            with open(TODO_FILE, 'rb') as f, gc_paused():
+                stat = _todo_file_stat = file_stat(f.fileno())
+                todos = loads_json(f.read())
+        except ValueError as e:
+            # Never treat a damaged file as empty - the next save would wipe it
+            raise damaged_store(TODO_FILE, e)
+    if journal is not None:
+        todos = replay_journal(todos)
+    _parsed["key"] = (stat, journal)
+    changed = migrate_todo_ids(todos)
+    if migrate_todo_timestamps(todos) or changed:
+        save_todos(todos)  # One-time upgrade of files from before todo ids / timestamps
+        _parsed["key"] = None
+    return todos
+
+def status_counts(todos):
+    """{status: count} over a list of todos"""
+    counts = {}
+    for todo in todos:
+        status = todo.get('status', 'pending')
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+def load_todo_page(focus, page, limit):
+    """One page of a focus: (todos, counts, page, pages, start)
+
+    page is 1-based and clamped to the pages that exist; counts holds the
+    status counts of the whole focus. The sqlite engine reads just the
+    window through its focus index and counts in the database, the other
+    engines load the focus and slice it.
+    """
+    engine = storage_engine()
+    if engine == "sqlite" and not _resident["on"]:
+        counts = db_status_counts(focus)
+        page, pages, start = page_window(sum(counts.values()), page, limit)
+        return list(iter_db(focus, start, limit)), counts, page, pages, start
+    if engine == "packed" and not _resident["on"]:
+        return load_pack_page(focus, page, limit)
+    todos = load_todos(focus)
+    page, pages, start = page_window(len(todos), page, limit)
+    return todos[start:start + limit], status_counts(todos), page, pages, start
+
+def page_window(total, page, limit):
+    """Clamp a 1-based page, return (page, pages, start)"""
+    pages = max(1, -(-total // limit))
+    page = min(max(1, page), pages)
+    return page, pages, (page - 1) * limit
+
+def save_todos(todos, engine=None):
+    """Save the complete todo list; a failed write raises StorageError
+
+    engine defaults to the configured one.
+    """
+    global _todo_file_stat
+    ensure_data_dir()
+    wait_for_compaction()  # Don't let an older snapshot land on top of this one
+    with storage_write(), data_lock():
+        backup_data()  # Backup before saving
+        engine = engine or storage_engine()
+        if engine == "sharded":
+            save_shards(todos)
+            return
+        if engine == "sqlite":
+            save_db(todos)
+            return
+        if engine == "packed":
+            save_pack(todos)
+            return
+        atomic_write(TODO_FILE, encode_todos(todos))
+        _todo_file_stat = file_stat(TODO_FILE)
+        # The snapshot now holds everything the journal did
+        if JOURNAL_FILE.exists():
+            JOURNAL_FILE.unlink()
+
+def commit_todos(todos, ops, focus=None):
+    """Persist a mutation of todos using the configured storage engine
+
+    todos is the list after the mutation - every todo, only those of
+    focus when the caller loaded a single focus, or None when the caller
+    holds no list at all - and ops the journal records describing it
+    (see make_op). The json engine rewrites the
+    whole file, the journal engine appends only the records, the sharded
+    engine rewrites only the shards the records touch and the sqlite
+    engine applies the records in one transaction.
+    
+    Everything happens under data_lock(). When another process changed
+    the data since it was loaded, the records are replayed onto what is
+    on disk now instead of writing the caller's stale list, so concurrent
+    commands merge rather than clobber each other. A failed write raises
+    StorageError.
+    """
+    if not ops:
+        return
+    engine = storage_engine()
+    ensure_data_dir()
+    wait_for_compaction()
+    with data_lock():
+        # A resident store that matched the files before this write
+        # only needs the records applied to match them afterwards
+        before = store_signature()
+        fresh = _resident["on"] and before == _resident["signature"]
+        with storage_write():
+            size = _write_ops(engine, todos, ops, focus)
+        after = store_signature()
+        if fresh:
+            _resident["index"].apply(ops)
+            _resident["signature"] = after
+        log_search_ops(before, after, ops)
+    if size > JOURNAL_COMPACT_BYTES:
+        compact_journal()
+
+def _write_ops(engine, todos, ops, focus):
+    """Write ops with engine under data_lock(), return the journal size"""
+    if engine == "json":
+        owned = todos is None or focus is not None or file_stat(TODO_FILE) != _todo_file_stat
+        if owned:
+            todos = apply_ops(load_todos() if _resident["on"] else _take_parsed(), _private_ops(ops))
+        before = file_stat(TODO_FILE)
+        save_todos(todos)
+        if owned and not _resident["on"] and file_stat(TODO_FILE) != before:
+            _parsed.update(key=_json_store_key(), todos=todos)  # What the next load would parse
+        return 0
+    backup_data()  # Cheap unless a backup generation is due
+    if engine == "sharded":
+        commit_shards(ops)
+        return 0
+    if engine == "sqlite":
+        commit_db(ops)
+        return 0
+    if engine == "packed":
+        commit_pack(ops)
+        return 0
+    parsed = _parsed.pop("todos", None) if _parsed["key"] == _json_store_key() else None
+    with open(JOURNAL_FILE, 'ab') as f:
+        f.write(b''.join([dumps_json(op) + b'\n' for op in ops]))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    if parsed is not None:
+        _parsed.update(key=_json_store_key(), todos=apply_ops(parsed, _private_ops(ops)))
+    return size
+
+def drop_focus(focus):
+    """Delete every todo of a focus"""
+    commit_todos([], [{'op': 'drop', 'focus': focus}], focus=focus)
+
+def switch_storage(config, engine):
+    """Move the todos over to another storage engine and select it
+
+    The engine is only selected once it holds the todos, so a failed
+    write leaves the old one in use.
+    """
+    todos = load_todos()
+    save_todos(todos, engine)
+    config["storage"] = engine
+    save_config(config)
+
+
+# Sharded Storage
+#
+# todos.d/ holds one JSON list per focus plus manifest.json naming the
+# shard of every focus, so listing or changing one focus only reads and
+# writes that focus' shard.
+
+def shard_file(focus):
+    """Shard path of a focus - readable name plus a hash against collisions"""
+    import hashlib
+    safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in focus)[:40]
+    digest = hashlib.sha1(focus.encode('utf-8')).hexdigest()[:8]
+    return SHARD_DIR / f"{safe}-{digest}.json"
+
+def _load_shard_manifest():
+    return _read_json(SHARD_DIR / "manifest.json", {"shards": {}})
+
+def _save_shard_manifest(manifest):
+    _write_json(SHARD_DIR / "manifest.json", manifest)
+
+def _read_shard(path):
+    if not path.exists():
+        return []
+    try:
+        with open(path, 'rb') as f, gc_paused():
+            stat = file_stat(f.fileno())
+            todos = loads_json(f.read())
+    except ValueError as e:
+        raise damaged_store(path, e)
+    if migrate_todo_timestamps(todos):
+        # One-time upgrade of shards from before timestamps, unless the
+        # shard changed meanwhile (then the next read upgrades it)
+        with data_lock():
+            if file_stat(path) == stat:
+                atomic_write(path, encode_todos(todos))
+    return todos
+
+def load_shards(focus=None):
+    """Load one focus' shard, or every shard in manifest order"""
+    if focus is not None:
+        return _read_shard(shard_file(focus))
+    todos = []
+    for name in _load_shard_manifest()["shards"].values():
+        todos.extend(_read_shard(SHARD_DIR / name))
+    return todos
+
+def write_shard(focus, todos):
+    atomic_write(shard_file(focus), encode_todos(todos))
+
+def save_shards(todos):
+    """Rewrite every shard and the manifest from the complete todo list"""
+    SHARD_DIR.mkdir(exist_ok=True, parents=True)
+    by_focus = {}
+    for todo in todos:
+        by_focus.setdefault(todo.get('focus'), []).append(todo)
+    for focus, shard in by_focus.items():
+        write_shard(focus, shard)
+    manifest = {"shards": {f: shard_file(f).name for f in by_focus}}
+    _save_shard_manifest(manifest)
+    # Drop shards of focuses that no longer have todos
+    live = set(manifest["shards"].values())
+    for path in SHARD_DIR.glob("*-*.json"):
+        if path.name not in live:
+            path.unlink()
+
+def commit_shards(ops):
+    """Patch only the shards touched by ops, as they are on disk now"""
+    SHARD_DIR.mkdir(exist_ok=True, parents=True)
+    manifest = _load_shard_manifest()
+    shards = manifest["shards"]
+    changed = False
+    by_focus = {}
+    for record in ops:
+        by_focus.setdefault(op_focus(record), []).append(record)
+    for target, records in by_focus.items():
+        if any(r.get('op') == 'drop' for r in records):
+            path = shard_file(target)
+            if path.exists():
+                path.unlink()
+            changed = shards.pop(target, None) is not None or changed
+            continue
+        write_shard(target, apply_ops(load_shards(target), records))
+        if target not in shards:
+            shards[target] = shard_file(target).name
+            changed = True
+    if changed:
+        _save_shard_manifest(manifest)
+
+
+# SQLite Storage
+#
+# todos.db keeps one row per todo, indexed on focus, status and created.
+# Todo keys without a column of their own ride along as JSON in 'extra'.
+
+DB_COLUMNS = ('id', 'text', 'status', 'focus', 'created', 'created_ts')
+
+_db = None
+
+def get_db():
+    """Open (once) and return the todo database"""
+    global _db
+    if _db is None:
+        import sqlite3  # Optional - only needed by the sqlite engine
+        ensure_data_dir()
+        _db = sqlite3.connect(str(TODO_DB), timeout=30)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.executescript("""
+            CREATE TABLE IF NOT EXISTS todos (
+                id TEXT PRIMARY KEY,
+                pos INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                status TEXT NOT NULL,
+                focus TEXT NOT NULL,
+                created TEXT NOT NULL,
+                extra TEXT,
+                created_ts INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS todos_focus ON todos (focus, pos);
+            CREATE INDEX IF NOT EXISTS todos_status ON todos (status);
+            CREATE INDEX IF NOT EXISTS todos_created ON todos (created);
+        """)
+        if 'created_ts' not in [row[1] for row in _db.execute("PRAGMA table_info(todos)")]:
+            _migrate_db_timestamps(_db)
+    return _db
+
+def _migrate_db_timestamps(db):
+    """Add the created_ts column to a database from before it, filled in"""
+    with db:
+        db.execute("ALTER TABLE todos ADD COLUMN created_ts INTEGER")
+        rows = db.execute("SELECT id, created FROM todos").fetchall()
+        db.executemany("UPDATE todos SET created_ts = ? WHERE id = ?",
+                       [(todo_timestamp(created), todo_id) for todo_id, created in rows])
+        _bump_db_generation(db)
+
+def close_db():
+    """Checkpoint the WAL into todos.db and close it"""
+    global _db
+    if _db is not None:
+        _db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        _db.close()
+        _db = None
+
+def _db_row(todo, pos):
+    extra = {k: v for k, v in todo.items() if k not in DB_COLUMNS}
+    return (todo['id'], pos, todo.get('text', ''), todo.get('status', 'pending'),
+            todo.get('focus', 'default'), todo.get('created', ''),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+            todo['created_ts'] if 'created_ts' in todo else todo_timestamp(todo.get('created')))
+
+def iter_db(focus=None, start=0, limit=None):
+    """Yield todos from the database one row at a time
+
+    start and limit select a window through the (focus, pos) index.
+    """
+    query = "SELECT id, text, status, focus, created, created_ts, extra FROM todos"
+    params = []
+    if focus is not None:
+        query += " WHERE focus = ?"
+        params.append(focus)
+    query += " ORDER BY pos"
+    if limit is not None or start:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, start])
+    for row in get_db().execute(query, params):
+        todo = dict(zip(DB_COLUMNS, row))
+        if row[6]:
+            todo.update(json.loads(row[6]))
+        yield todo
+
+def load_db(focus=None):
+    """Load todos from the database, optionally only one focus"""
+    return list(iter_db(focus))
+
+def db_status_counts(focus):
+    """{status: count} of a focus, counted by the database"""
+    rows = get_db().execute("SELECT status, COUNT(*) FROM todos WHERE focus = ? GROUP BY status", (focus,))
+    return dict(rows)
+
+def db_generation():
+    """Write counter of the database, bumped by every change to the todos"""
+    return get_db().execute("PRAGMA user_version").fetchone()[0]
+
+def _bump_db_generation(db):
+    db.execute(f"PRAGMA user_version = {db_generation() + 1}")
+
+def save_db(todos):
+    """Replace the database contents with the complete todo list"""
+    db = get_db()
+    with db:
+        db.execute("DELETE FROM todos")
+        db.executemany("INSERT OR REPLACE INTO todos VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (_db_row(t, pos) for pos, t in enumerate(todos)))
+        _bump_db_generation(db)
+
+def commit_db(ops):
+    """Apply journal records to the database in a single transaction"""
+    db = get_db()
+    with db:
+        pos = db.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM todos").fetchone()[0]
+        for record in ops:
+            op = record.get('op')
+            if op == 'add':
+                db.execute("INSERT OR IGNORE INTO todos VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           _db_row(record['todo'], pos))
+                pos += 1
+            elif op == 'set':
+                db.execute("UPDATE todos SET status = ? WHERE id = ?",
+                           (record.get('status', 'pending'), record['id']))
+            elif op == 'del':
+                db.execute("DELETE FROM todos WHERE id = ?", (record['id'],))
+            elif op == 'drop':
+                db.execute("DELETE FROM todos WHERE focus = ?", (record['focus'],))
+        _bump_db_generation(db)
+
+def import_to_sqlite(source=None):
+    """One-shot import into the sqlite engine, which is then selected
+
+    source is None for the current todos, a backup generation number or
+    the name of an old-style backups/todos_*.json copy.
+    """
+    if source is None:
+        todos = load_todos()
+    elif str(source).isdigit():
+        todos = load_backup_todos(int(source))
+    else:
+        todos = _read_json(_backup_dir() / source, None)
+        if todos is None:
+            raise ValueError(f"No backup named {source}")
+    migrate_todo_ids(todos)
+    migrate_todo_timestamps(todos)
+    save_todos(todos, "sqlite")
+    config = load_config()
+    config["storage"] = "sqlite"
+    save_config(config)
+    return len(todos)
+
+
+# Packed Storage
+#
+# todos.pack is a compact binary snapshot, read through mmap:
+#
+#   header   magic, version, record count, string table and index offsets
+#   records  each a u32 length, then the status and focus as string table
+#            numbers, created_ts, a mask of the fields present and the
+#            lengths of the id, text, created and extra (JSON) strings,
+#            followed by those strings
+#   strings  every status and focus value, stored once
+#   index    per focus its string number, record count and where its
+#            record offsets are, followed by the offsets themselves
+#
+# Loading one focus decodes only that focus' records, and a commit
+# decodes only the focuses its records touch - every other record is
+# copied over byte for byte.
+
+PACK_MAGIC = b'GHOSTYPK'
+PACK_VERSION = 1
+PACK_HEADER = '<8sHHIQQ'        # magic, version, unused, records, strings at, index at
+PACK_RECORD = '<IIIqBIIII'      # length, status, focus, created_ts, mask, 4 string lengths
+PACK_FOCUS = '<IIQ'             # focus string, record count, offsets at
+PACK_HAS = {'id': 1, 'text': 2, 'status': 4, 'focus': 8, 'created': 16, 'created_ts': 32}
+
+def pack_record(todo, table):
+    """One todo as record bytes; new status/focus strings join table"""
+    import struct
+    extra = todo.extra if type(todo) is Todo else {k: v for k, v in todo.items() if k not in _TODO_FIELD_SET}
+    extra = dict(extra) if extra else {}
+    mask = 0
+    refs = []
+    for name in ('status', 'focus'):
+        value = todo.get(name, _UNSET)
+        ref = 0
+        if type(value) is str:
+            ref = table.get(value)
+            if ref is None:
+                ref = table[value] = len(table)
+            mask |= PACK_HAS[name]
+        elif value is not _UNSET:
+            extra[name] = value  # Oddly typed values ride along in extra
+        refs.append(ref)
+    ts = todo.get('created_ts', _UNSET)
+    if type(ts) is int and -2 ** 63 <= ts < 2 ** 63:
+        mask |= PACK_HAS['created_ts']
+    else:
+        if ts is not _UNSET:
+            extra['created_ts'] = ts
+        ts = 0
+    strings = []
+    for name in ('id', 'text', 'created'):
+        value = todo.get(name, _UNSET)
+        if type(value) is str:
+            mask |= PACK_HAS[name]
+            strings.append(value.encode('utf-8', 'surrogatepass'))
+        else:
+            if value is not _UNSET:
+                extra[name] = value
+            strings.append(b'')
+    strings.append(json.dumps(extra, ensure_ascii=False).encode('utf-8') if extra else b'')
+    body = b''.join(strings)
+    return struct.pack(PACK_RECORD, struct.calcsize(PACK_RECORD) - 4 + len(body), refs[0], refs[1], ts, mask,
+                       *[len(s) for s in strings]) + body
+
+def unpack_record(buf, offset, strings):
+    """The todo whose record starts at offset"""
+    import struct
+    _, status, focus, ts, mask, n_id, n_text, n_created, n_extra = struct.unpack_from(PACK_RECORD, buf, offset)
+    pos = offset + struct.calcsize(PACK_RECORD)
+    todo = Todo.__new__(Todo)
+    todo.status = strings[status] if mask & 4 else _UNSET
+    todo.focus = strings[focus] if mask & 8 else _UNSET
+    todo.created_ts = ts if mask & 32 else _UNSET
+    todo.id = buf[pos:pos + n_id].decode('utf-8', 'surrogatepass') if mask & 1 else _UNSET
+    pos += n_id
+    todo.text = buf[pos:pos + n_text].decode('utf-8', 'surrogatepass') if mask & 2 else _UNSET
+    pos += n_text
+    todo.created = buf[pos:pos + n_created].decode('utf-8', 'surrogatepass') if mask & 16 else _UNSET
+    pos += n_created
+    todo.extra = None
+    if n_extra:
+        extra = json.loads(buf[pos:pos + n_extra].decode('utf-8'))
+        for name in _TODO_FIELD_SET.intersection(extra):
+            todo[name] = extra.pop(name)
+        todo.extra = extra or None
+    return todo
+
+def build_pack(records, strings):
+    """Pack file bytes from (focus string number or None, record) pairs"""
+    import struct
+    header_size = struct.calcsize(PACK_HEADER)
+    parts = [b'']
+    offsets = {}
+    at = header_size
+    for ref, record in records:
+        if ref is not None:
+            offsets.setdefault(ref, []).append(at)
+        parts.append(record)
+        at += len(record)
+    strings_at = at
+    encoded = [s.encode('utf-8', 'surrogatepass') for s in strings]
+    table = struct.pack('<I', len(encoded)) + b''.join(struct.pack('<I', len(s)) + s for s in encoded)
+    parts.append(table)
+    index_at = strings_at + len(table)
+    parts.append(struct.pack('<I', len(offsets)))
+    offsets_at = index_at + 4 + struct.calcsize(PACK_FOCUS) * len(offsets)
+    for ref, focus_offsets in offsets.items():
+        parts.append(struct.pack(PACK_FOCUS, ref, len(focus_offsets), offsets_at))
+        offsets_at += 8 * len(focus_offsets)
+    parts.extend(struct.pack(f'<{len(o)}Q', *o) for o in offsets.values())
+    parts[0] = struct.pack(PACK_HEADER, PACK_MAGIC, PACK_VERSION, 0, len(records), strings_at, index_at)
+    return b''.join(parts)
+
+def encode_pack(todos):
+    """Pack file bytes holding todos"""
+    table = {}
+    records = []
+    for todo in todos:
+        focus = todo.get('focus')
+        record = pack_record(todo, table)
+        records.append((table[focus] if type(focus) is str else None, record))
+    return build_pack(records, list(table))
+
+def read_pack_index(buf):
+    """(record count, strings, {focus: (records, offsets at)}) of a pack"""
+    import struct
+    magic, version, _, count, strings_at, index_at = struct.unpack_from(PACK_HEADER, buf, 0)
+    if magic != PACK_MAGIC:
+        raise ValueError("not a ghosty pack file")
+    if version != PACK_VERSION:
+        raise ValueError(f"pack version {version} is newer than this ghosty")
+    strings = []
+    pos = strings_at + 4
+    for _ in range(struct.unpack_from('<I', buf, strings_at)[0]):
+        length = struct.unpack_from('<I', buf, pos)[0]
+        strings.append(sys.intern(buf[pos + 4:pos + 4 + length].decode('utf-8', 'surrogatepass')))
+        pos += 4 + length
+    focuses = {}
+    pos = index_at + 4
+    for _ in range(struct.unpack_from('<I', buf, index_at)[0]):
+        ref, records, offsets_at = struct.unpack_from(PACK_FOCUS, buf, pos)
+        focuses[strings[ref]] = (records, offsets_at)
+        pos += struct.calcsize(PACK_FOCUS)
+    return count, strings, focuses
+
+def pack_offsets(buf, count, focuses, focus=None):
+    """Record offsets of one focus from the index, or of every record"""
+    import struct
+    if focus is not None:
+        records, offsets_at = focuses.get(focus, (0, 0))
+        return struct.unpack_from(f'<{records}Q', buf, offsets_at) if records else ()
+    offsets = []
+    at = struct.calcsize(PACK_HEADER)
+    for _ in range(count):
+        offsets.append(at)
+        at += 4 + struct.unpack_from('<I', buf, at)[0]
+    return offsets
+
+def decode_pack(buf, focus=None):
+    """Todos in pack bytes (or a mapped pack file), optionally one focus"""
+    count, strings, focuses = read_pack_index(buf)
+    with gc_paused():
+        return [unpack_record(buf, offset, strings) for offset in pack_offsets(buf, count, focuses, focus)]
+
+@contextmanager
+def mapped_pack():
+    """todos.pack mapped into memory, None when there is none"""
+    import mmap
+    import struct
+    try:
+        f = open(PACK_FILE, 'rb')
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            try:
+                yield buf
+            except (ValueError, IndexError, struct.error) as e:
+                raise damaged_store(PACK_FILE, e)
+
+def load_pack(focus=None):
+    """Load todos from todos.pack, decoding only focus' records if given"""
+    with mapped_pack() as buf:
+        return decode_pack(buf, focus) if buf is not None else []
+
+def load_pack_page(focus, page, limit):
+    """One page of a focus, as load_todo_page returns it
+
+    The counts only read each record's status number; just the todos on
+    the page are decoded.
+    """
+    import struct
+    with mapped_pack() as buf:
+        if buf is None:
+            return [], {}, 1, 1, 0
+        count, strings, focuses = read_pack_index(buf)
+        offsets = pack_offsets(buf, count, focuses, focus)
+        counts = {}
+        for offset in offsets:
+            status, mask = struct.unpack_from('<4xI12xB', buf, offset)
+            status = strings[status] if mask & 4 else unpack_record(buf, offset, strings).get('status', 'pending')
+            counts[status] = counts.get(status, 0) + 1
+        page, pages, start = page_window(len(offsets), page, limit)
+        todos = [unpack_record(buf, offset, strings) for offset in offsets[start:start + limit]]
+        return todos, counts, page, pages, start
+
+def save_pack(todos):
+    atomic_write(PACK_FILE, encode_pack(todos))
+
+def commit_pack(ops):
+    """Apply journal records, re-encoding only the focuses they touch"""
+    import struct
+    by_focus = {}
+    for record in ops:
+        by_focus.setdefault(op_focus(record), []).append(record)
+    with mapped_pack() as buf:
+        if buf is None:
+            data = encode_pack(apply_ops([], list(ops)))
+        else:
+            count, strings, _ = read_pack_index(buf)
+            table = {s: i for i, s in enumerate(strings)}
+            records = []
+            touched = {focus: [] for focus in by_focus}
+            for offset in pack_offsets(buf, count, None):
+                length, _, focus, _, mask = struct.unpack_from('<IIIqB', buf, offset)
+                focus = strings[focus] if mask & 8 else None
+                if focus in touched:
+                    touched[focus].append(unpack_record(buf, offset, strings))
+                else:
+                    records.append((table[focus] if focus is not None else None, buf[offset:offset + 4 + length]))
+            for focus, todos in touched.items():
+                for todo in apply_ops(todos, by_focus[focus]):
+                    record = pack_record(todo, table)
+                    todo_focus = todo.get('focus')
+                    records.append((table[todo_focus] if type(todo_focus) is str else None, record))
+            data = build_pack(records, list(table))
+    atomic_write(PACK_FILE, data)
+
+def read_todo_file(path):
+    """Todos in a todos.json-style list or a pack file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(PACK_MAGIC):
+        return decode_pack(data)
+    with gc_paused():
+        todos = loads_json(data)
+    if not isinstance(todos, list):
+        raise ValueError(f"{path} holds no todo list")
+    return todos
+
+def write_todo_file(path, todos):
+    """Write todos as a pack file when path ends in .pack, else as JSON"""
+    if str(path).endswith('.pack'):
+        atomic_write(path, encode_pack(todos))
+    else:
+        atomic_write(path, encode_todos(todos))
+
+
+# Todo Records & Index
+
+TODO_FIELDS = ('id', 'text', 'status', 'focus', 'created', 'created_ts')
+TODO_STATUSES = ("pending", "done", "on-hold")
+_TODO_FIELD_SET = frozenset(TODO_FIELDS)
+_UNSET = object()  # A field the todo doesn't have, unlike one set to None
+
+class Todo(MutableMapping):
+    """One todo as a compact record
+
+    The known fields live in __slots__ and any other keys in extra, so a
+    todo costs a fraction of the dict it replaces. status and focus are
+    interned, so a million todos share a handful of those strings.
+    Todos still read and write like dicts - todo['status'],
+    todo.get('focus') - but json.dumps needs default=todo_json.
+
+    The resident store (see Resident store) holds Todos, as does what
+    the packed engine decodes. Loads from JSON and sqlite hand out plain
+    dicts: converting a million parsed dicts takes longer than parsing
+    them, so only a process that keeps them pays for it.
+    """
+    __slots__ = TODO_FIELDS + ('extra',)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Todo from a dict (or another Todo)"""
+        todo = cls.__new__(cls)
+        get = data.get
+        todo.id = get('id', _UNSET)
+        todo.text = get('text', _UNSET)
+        status = get('status', _UNSET)
+        todo.status = sys.intern(status) if type(status) is str else status
+        focus = get('focus', _UNSET)
+        todo.focus = sys.intern(focus) if type(focus) is str else focus
+        todo.created = get('created', _UNSET)
+        todo.created_ts = get('created_ts', _UNSET)
+        todo.extra = None
+        if not data.keys() <= _TODO_FIELD_SET:
+            todo.extra = {k: v for k, v in data.items() if k not in _TODO_FIELD_SET}
+        return todo
+    
+    def to_dict(self):
+        data = {'id': self.id, 'text': self.text, 'status': self.status, 'focus': self.focus,
+                'created': self.created, 'created_ts': self.created_ts}
+        if _UNSET in data.values():
+            data = {name: value for name, value in data.items() if value is not _UNSET}
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def copy(self):
+        todo = Todo.__new__(Todo)
+        todo.id, todo.text, todo.status = self.id, self.text, self.status
+        todo.focus, todo.created, todo.created_ts = self.focus, self.created, self.created_ts
+        todo.extra = dict(self.extra) if self.extra else None
+        return todo
+    
+    def get(self, key, default=None):
+        if key in _TODO_FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        return self.extra.get(key, default) if self.extra else default
+    
+    def __getitem__(self, key):
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key):
+        return self.get(key, _UNSET) is not _UNSET
+    
+    def __setitem__(self, key, value):
+        if key in _TODO_FIELD_SET:
+            setattr(self, key, _intern(value) if key in ('status', 'focus') else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in _TODO_FIELD_SET:
+            setattr(self, key, _UNSET)
+        else:
+            del self.extra[key]
+    
+    def __iter__(self):
+        for name in TODO_FIELDS:
+            if getattr(self, name) is not _UNSET:
+                yield name
+        if self.extra:
+            yield from self.extra
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"Todo({self.to_dict()!r})"
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic GC while a million new objects are made
+
+    They would otherwise set off collections that double the time taken.
+    """
+    paused = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if paused:
+            gc.enable()
+
+def as_todos(todos):
+    """Turn every dict in the list into a Todo in place, return the list
+
+    Each dict is dropped as soon as its Todo replaces it.
+    """
+    with gc_paused():
+        for i, todo in enumerate(todos):
+            if type(todo) is not Todo:
+                todos[i] = Todo.from_dict(todo)
+    return todos
+
+def todo_json(obj):
+    """json.dumps default= hook writing Todos as plain objects"""
+    if isinstance(obj, Todo):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def new_todo_id():
+    """Random 64-bit id, unique enough to never collide in one store"""
+    return os.urandom(8).hex()
+
+def new_todo(text, focus):
+    """Create a pending todo in focus"""
+    from datetime import datetime
+    now = time.time()
+    return {
+        'id': new_todo_id(),
+        'text': text,
+        'status': 'pending',
+        'focus': focus,
+        'created': datetime.fromtimestamp(now).isoformat(),
+        'created_ts': int(now)
+    }
+
+def migrate_todo_ids(todos):
+    """Give every todo a unique id, return True if anything changed"""
+    seen = set()
+    changed = False
+    for todo in todos:
+        if todo.get('id') is None or todo['id'] in seen:
+            todo['id'] = new_todo_id()
+            changed = True
+        seen.add(todo['id'])
+    return changed
+
+def todo_timestamp(created):
+    """Epoch seconds of an ISO 'created' string, None if it doesn't parse"""
+    from datetime import datetime
+    try:
+        return int(datetime.fromisoformat(created).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+def migrate_todo_timestamps(todos):
+    """Store 'created_ts' next to 'created', return True if anything changed
+
+    Rendering ages then needs integer math only, no ISO parsing.
+    """
+    changed = False
+    for todo in todos:
+        if 'created_ts' not in todo:
+            todo['created_ts'] = todo_timestamp(todo.get('created'))
+            changed = True
+    return changed
+
+class TodoIndex:
+    """In-memory indexes over the todo list
+
+    by_id maps id -> todo in list order and by_focus maps each focus to
+    its own ordered id -> todo map, so finding, adding or removing k
+    todos costs O(k) regardless of how many todos there are.
+    """
+    
+    def __init__(self, todos):
+        self.by_id = {}
+        self.by_focus = {}
+        for todo in todos:
+            self.add(todo)
+    
+    def add(self, todo):
+        self.by_id[todo['id']] = todo
+        self.by_focus.setdefault(todo.get('focus'), {})[todo['id']] = todo
+    
+    def remove(self, todo_id):
+        todo = self.by_id.pop(todo_id)
+        del self.by_focus[todo.get('focus')][todo_id]
+        return todo
+    
+    def get(self, todo_id):
+        return self.by_id.get(todo_id)
+    
+    def apply(self, ops):
+        """Apply journal records in place (see apply_ops)"""
+        for record in ops:
+            op = record.get('op')
+            if op == 'add' and record['todo']['id'] not in self.by_id:
+                self.add(Todo.from_dict(record['todo']))
+            elif op == 'set' and record['id'] in self.by_id:
+                self.by_id[record['id']]['status'] = record.get('status', 'pending')
+            elif op == 'del' and record['id'] in self.by_id:
+                self.remove(record['id'])
+            elif op == 'drop':
+                for todo_id in list(self.by_focus.pop(record.get('focus'), {})):
+                    del self.by_id[todo_id]
+    
+    def focus(self, focus):
+        """Todos of one focus in display order"""
+        return list(self.by_focus.get(focus, {}).values())
+    
+    def todos(self):
+        """All todos in storage order"""
+        return list(self.by_id.values())
+
+
+# Batch Mutations
+# check, hold, remove, move and mark all change the todos selected by
+# number the same way: batch_mutate() builds the journal records in one
+# pass over the selection, commits them with a single commit_todos() and
+# returns a summary that the menu and the CLI each render.
+
+BATCH_ACTIONS = ["check", "hold", "remove", "move", "mark"]
+# Change labels in summary order, with how they read in a count
+BATCH_LABELS = [("checked", "checked"), ("unchecked", "unchecked"), ("held", "on hold"),
+                ("unheld", "unheld"), ("removed", "removed"), ("moved", "moved"), ("marked", "marked")]
+
+def batch_mutate(index, todos, numbers, action, focus, value=None):
+    """Apply action to the todos numbers selects and commit, return a summary
+    
+    todos is the focus' list in display order and index the TodoIndex
+    holding it. check and hold toggle, remove deletes, move sends todos
+    to the focus value and mark sets the status value. The summary is
+    {"changes": [(label, number, todo)], "invalid": [...], "counts":
+    [(label, count)]}, changes from the highest number down.
+    """
+    ops = []
+    changes = []
+    moved = []
+    for number in numbers.descending(len(todos)):
+        todo = index.get(todos[number - 1]['id'])
+        if action == 'remove':
+            ops.append(make_op('del', index.remove(todo['id'])))
+            changes.append(('removed', number, todo))
+            continue
+        if action == 'move':
+            if todo.get('focus') != value:
+                moved.append(todo)
+                changes.append(('moved', number, todo))
+            continue
+        if action == 'check':
+            label = 'unchecked' if todo.get('status') == 'done' else 'checked'
+            status = 'pending' if label == 'unchecked' else 'done'
+        elif action == 'hold':
+            label = 'unheld' if todo.get('status') == 'on-hold' else 'held'
+            status = 'pending' if label == 'unheld' else 'on-hold'
+        else:
+            label, status = 'marked', value
+        todo['status'] = status
+        ops.append(make_op('set', todo))
+        changes.append((label, number, todo))
+    # Moved todos keep their order at the end of the other focus
+    for todo in reversed(moved):
+        ops.append(make_op('del', index.remove(todo['id'])))
+        todo['focus'] = value
+        index.add(todo)
+        ops.append(make_op('add', todo))
+    commit_todos(index.todos(), ops, focus=focus)
+    
+    tally = {}
+    for label, _, _ in changes:
+        tally[label] = tally.get(label, 0) + 1
+    return {
+        "changes": changes,
+        "invalid": numbers.invalid(len(todos)),
+        "counts": [(name, tally[label]) for label, name in BATCH_LABELS if label in tally],
+    }
+
+
+# Journal Storage
+
+_compactor = None
+
+def todo_key(todo):
+    """Identity of a todo inside the journal"""
+    if 'id' in todo:
+        return todo['id']
+    return (todo.get('text'), todo.get('created'))  # Journals from before todo ids
+
+def make_op(op, todo):
+    """Build a journal record: 'add', 'set' (status change) or 'del'
+
+    The fourth kind, 'drop', deletes a whole focus (see drop_focus).
+    """
+    if op == 'add':
+        return {'op': 'add', 'todo': todo}
+    record = {'op': op, 'id': todo['id'], 'focus': todo.get('focus')}
+    if op == 'set':
+        record['status'] = todo.get('status')
+    return record
+
+def op_focus(record):
+    """Focus a journal record applies to"""
+    if record.get('op') == 'add':
+        return record['todo'].get('focus')
+    return record.get('focus')
+
+def apply_ops(todos, ops):
+    """Apply journal records to a todo list, return the resulting list
+
+    Records are idempotent, so replaying ones already folded into the
+    list (e.g. after an interrupted compaction) is harmless.
+    """
+    index = {todo_key(t): t for t in todos}
+    for record in ops:
+        op = record.get('op')
+        if op == 'add':
+            todo = record.get('todo', {})
+            if todo_key(todo) not in index:
+                todos.append(todo)
+                index[todo_key(todo)] = todo
+        elif op == 'set':
+            todo = index.get(todo_key(record))
+            if todo is not None:
+                todo['status'] = record.get('status', 'pending')
+        elif op == 'del':
+            index.pop(todo_key(record), None)
+        elif op == 'drop':
+            focus = record.get('focus')
+            for key in [k for k, t in index.items() if t.get('focus') == focus]:
+                del index[key]
+    return [t for t in todos if index.get(todo_key(t)) is t]
+
+def _read_journal():
+    with open(JOURNAL_FILE, 'rb') as f:
+        for line in f:
+            try:
+                yield loads_json(line)
+            except ValueError:
+                continue  # Torn write at the end of the journal
+
+def replay_journal(todos):
+    """Apply the journal records on top of a snapshot"""
+    try:
+        return apply_ops(todos, _read_journal())
+    except Exception:
+        return todos
+
+def compact_journal():
+    """Fold the journal into a fresh todos.json snapshot in the background"""
+    global _compactor
+    if _compactor is not None and _compactor.is_alive():
+        return
+    # Not a daemon thread, so a CLI call waits for the snapshot on exit
+    _compactor = threading.Thread(target=_write_compaction)
+    _compactor.start()
+
+def wait_for_compaction():
+    """Block until a running background compaction has finished"""
+    if (_compactor is not None and _compactor.is_alive()
+            and _compactor is not threading.current_thread()):
+        _compactor.join()
+
+def _write_compaction():
+    """Write a snapshot, then drop the journal records it covers
+
+    The snapshot is read from disk under the lock, so records appended by
+    other processes are included. If someone else compacted meanwhile
+    (todos.json or the journal changed identity), this run backs off.
+    """
+    global _todo_file_stat
+    tmp_file = TODO_FILE.with_name(f".{TODO_FILE.name}.{os.getpid()}.compact")
+    try:
+        with data_lock():
+            snapshot = load_todos()
+            base_stat = file_stat(TODO_FILE)
+            journal_stat = file_stat(JOURNAL_FILE)
+            if journal_stat is None:
+                return
+            offset = journal_stat[1]
+        backup_data()
+        with open(tmp_file, 'wb') as f:
+            f.write(encode_todos(snapshot))
+            f.flush()
+            os.fsync(f.fileno())
+        with data_lock():
+            current = file_stat(JOURNAL_FILE)
+            if file_stat(TODO_FILE) != base_stat or current is None or current[2] != journal_stat[2]:
+                tmp_file.unlink()
+                return
+            before = store_signature()
+            os.replace(str(tmp_file), str(TODO_FILE))
+            _todo_file_stat = file_stat(TODO_FILE)
+            # Keep records appended while the snapshot was being written
+            with open(JOURNAL_FILE, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            if tail:
+                atomic_write(JOURNAL_FILE, tail)
+            else:
+                JOURNAL_FILE.unlink()
+            log_search_ops(before, store_signature(), [])  # Same todos, new files
+    except Exception:
+        # The journal is still intact, compaction retries later
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+# Search Index
+# An inverted index from words to todo ids, saved in search_index.json.
+# Every commit_todos appends its records to search_index.log along with
+# the store signature before and after the write, so a search replays
+# just the writes since the index was saved. Writes the log can't chain
+# (a restore, an import, another storage engine) rebuild the index.
+
+SEARCH_LOG_BYTES = 256 * 1024  # Fold the log into search_index.json past this size
+
+_search = {"signature": None, "index": None}
+
+def _search_index_file():
+    return DATA_DIR / "search_index.json"
+
+def _search_log_file():
+    return DATA_DIR / "search_index.log"
+
+def search_words(text):
+    """Lowercased words of text"""
+    return re.findall(r"\w+", text.lower())
+
+def within_one_edit(a, b):
+    """Whether one insert, delete, substitution or swap turns a into b"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+
+class SearchIndex:
+    """Inverted index over todo text
+    
+    docs maps id -> [focus, status, text] and postings each word to the
+    ids whose text contains it - a list as loaded from disk, turned into
+    a set once it changes. The sorted vocabulary for prefix lookups is
+    rebuilt only after a word was added or dropped, and the id sets per
+    focus and per status that filter results are built on first use.
+    """
+    
+    def __init__(self, todos=()):
+        self.docs = {}
+        self.postings = {}
+        self._vocabulary = None
+        self._facets = None
+        for todo in todos:
+            self.add(todo)
+    
+    def add(self, todo):
+        self.remove(todo['id'])
+        text = todo.get('text', '')
+        doc = self.docs[todo['id']] = [todo.get('focus'), todo.get('status', 'pending'), text]
+        self._facet_add(todo['id'], doc)
+        for word in set(search_words(text)):
+            if word not in self.postings:
+                self._vocabulary = None
+            self._ids(word).add(todo['id'])
+    
+    def remove(self, todo_id):
+        doc = self.docs.pop(todo_id, None)
+        if doc is None:
+            return
+        self._facet_remove(todo_id, doc)
+        for word in set(search_words(doc[2])):
+            ids = self._ids(word)
+            ids.discard(todo_id)
+            if not ids:
+                del self.postings[word]
+                self._vocabulary = None
+    
+    def _ids(self, word):
+        ids = self.postings.get(word)
+        if not isinstance(ids, set):
+            ids = self.postings[word] = set(ids or ())
+        return ids
+    
+    def facet(self, field, value):
+        """Ids whose doc has value in field (0 focus, 1 status)"""
+        if self._facets is None:
+            self._facets = {}
+            for todo_id, doc in self.docs.items():
+                self._facet_add(todo_id, doc)
+        return self._facets.get((field, value), set())
+    
+    def _facet_add(self, todo_id, doc):
+        if self._facets is not None:
+            self._facets.setdefault((0, doc[0]), set()).add(todo_id)
+            self._facets.setdefault((1, doc[1]), set()).add(todo_id)
+    
+    def _facet_remove(self, todo_id, doc):
+        if self._facets is not None:
+            self._facets.get((0, doc[0]), set()).discard(todo_id)
+            self._facets.get((1, doc[1]), set()).discard(todo_id)
+    
+    def apply(self, ops):
+        """Apply journal records in place (see apply_ops)"""
+        for record in ops:
+            op = record.get('op')
+            if op == 'add' and record['todo'].get('id') not in self.docs:
+                self.add(record['todo'])
+            elif op == 'set' and record.get('id') in self.docs:
+                doc = self.docs[record['id']]
+                self._facet_remove(record['id'], doc)
+                doc[1] = record.get('status', 'pending')
+                self._facet_add(record['id'], doc)
+            elif op == 'del':
+                self.remove(record.get('id'))
+            elif op == 'drop':
+                for todo_id in list(self.facet(0, record.get('focus'))):
+                    self.remove(todo_id)
+    
+    def vocabulary(self):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+    
+    def matches(self, word):
+        """Ids with a word starting with word, else within one typo of it
+        
+        Typo matching only looks at words sharing the first letter, which
+        keeps it to a slice of the vocabulary.
+        """
+        from bisect import bisect_left
+        vocabulary = self.vocabulary()
+        first = bisect_left(vocabulary, word)
+        last = first
+        while last < len(vocabulary) and vocabulary[last].startswith(word):
+            last += 1
+        if last - first == 1:
+            return self._ids(vocabulary[first])  # Shared, callers must not change it
+        ids = set()
+        for candidate in vocabulary[first:last]:
+            ids.update(self.postings[candidate])
+        if ids or len(word) < 3:
+            return ids
+        first = bisect_left(vocabulary, word[0])
+        last = bisect_left(vocabulary, chr(ord(word[0]) + 1), first)
+        for candidate in vocabulary[first:last]:
+            if within_one_edit(word, candidate):
+                ids.update(self.postings[candidate])
+        return ids
+    
+    def search(self, query, focus=None, status=None):
+        """Ids of the todos matching every word of query"""
+        words = set(search_words(query))
+        if not words:
+            return set()
+        found = [self.matches(word) for word in words]
+        if focus is not None:
+            found.append(self.facet(0, focus))
+        if status is not None:
+            found.append(self.facet(1, status))
+        found.sort(key=len)
+        return found[0].intersection(*found[1:])
+    
+    def to_json(self, signature):
+        return {"signature": signature, "docs": self.docs,
+                "postings": {word: list(ids) for word, ids in self.postings.items()}}
+    
+    @classmethod
+    def from_json(cls, data):
+        index = cls()
+        index.docs = data["docs"]
+        index.postings = data["postings"]
+        return index
+
+def _signature_json(signature):
+    return json.loads(json.dumps(signature))  # The tuples as saved to JSON
+
+def log_search_ops(before, after, ops):
+    """Chain a write onto the search index log, under data_lock()"""
+    before, after = _signature_json(before), _signature_json(after)
+    if _search["index"] is not None and _search["signature"] == before:
+        _search["index"].apply(ops)
+        _search["signature"] = after
+    if _search_index_file().exists():
+        with open(_search_log_file(), 'ab') as f:
+            f.write(dumps_json({"before": before, "after": after, "ops": ops}) + b'\n')
+            size = f.tell()
+        if size > SEARCH_LOG_BYTES:
+            # Only search_index() folds the log in, and there may be no search
+            # for a long time: fold it now if the index is at hand, else drop
+            # both files and let the next search rebuild them
+            if _search["index"] is not None and _search["signature"] == after:
+                _save_search_index(_search["index"], after)
+            else:
+                for path in (_search_index_file(), _search_log_file()):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+def _replay_search_log(index, signature):
+    """Apply the log links following signature, return where they end"""
+    try:
+        with open(_search_log_file(), 'rb') as f:
+            for line in f:
+                try:
+                    link = loads_json(line)
+                except ValueError:
+                    break  # Torn write at the end of the log
+                if link.get("before") == signature:
+                    index.apply(link.get("ops", []))
+                    signature = link.get("after")
+    except OSError:
+        pass
+    return signature
+
+def _save_search_index(index, signature):
+    atomic_write(_search_index_file(), dumps_json(index.to_json(signature)))
+    try:
+        _search_log_file().unlink()
+    except OSError:
+        pass
+
+def search_index():
+    """The search index, brought up to date with the stored todos"""
+    signature = _signature_json(store_signature())
+    if _search["index"] is not None and _search["signature"] == signature:
+        return _search["index"]
+    ensure_data_dir()
+    with data_lock():
+        signature = _signature_json(store_signature())
+        index, at = _search["index"], _search["signature"]
+        if index is not None:
+            at = _replay_search_log(index, at)
+        if at != signature:
+            try:
+                with open(_search_index_file(), 'rb') as f:
+                    data = loads_json(f.read())
+                index = SearchIndex.from_json(data)
+                at = _replay_search_log(index, data["signature"])
+            except (OSError, ValueError, KeyError, TypeError):
+                index = None
+        if index is None or at != signature:
+            index = SearchIndex(load_todos())
+            _save_search_index(index, signature)
+        elif (file_stat(_search_log_file()) or (0, 0))[1] > SEARCH_LOG_BYTES:
+            _save_search_index(index, signature)
+        _search["index"], _search["signature"] = index, signature
+    return index
+
+def search_todos(query, focus=None, status=None):
+    """Todos matching query as (number, todo) pairs in list order
+    
+    Numbers are positions within each todo's own focus, the ones every
+    other command takes.
+    """
+    index = search_index()
+    ids = index.search(query, focus, status)
+    names = {index.docs[i][0] for i in ids}
+    if _resident["on"]:
+        by_focus = {name: _resident_index().by_focus.get(name, {}).values() for name in names}  # No copies
+    elif len(names) == 1:
+        by_focus = {name: load_todos(name) for name in names}  # Sharded, sqlite and packed read just that
+    else:
+        # One pass over the store instead of one per focus with hits
+        by_focus = {name: [] for name in names}
+        for todo in load_todos():
+            bucket = by_focus.get(todo.get('focus'))
+            if bucket is not None:
+                bucket.append(todo)
+    results = []
+    for name in sorted(names, key=str):
+        for number, todo in enumerate(by_focus[name], 1):
+            if todo['id'] in ids:
+                results.append((number, todo.copy()))
+    return results
+
+DEFAULT_CONFIG = {
+    "current_focus": "default",
+    "focuses": ["default"],
+    "theme": "Ghosty Classic",
+    "alternate_banner": False,
+    "hide_banner": False,
+    "reprint_list": True,
+    "show_responses": True,
+    "storage": "json"
+}
+
+# Parsed config.json, revalidated against the file's stat on every load_config
+_config_cache = {"stat": None, "config": None}
+_applied_theme = None
+
+def _config_stat():
+    return file_stat(CONFIG_FILE)
+
+def _copy_config(config):
+    """Shallow copy that callers can mutate without touching the cache"""
+    copy = dict(config)
+    copy["focuses"] = list(config["focuses"])
+    return copy
+
+def _apply_config_theme(config):
+    global _applied_theme
+    if not G.PLAIN and config["theme"] != _applied_theme:
+        load_theme(config["theme"])
+        _applied_theme = config["theme"]
+
+def load_config():
+    """Load configuration
+
+    Served from memory while config.json's mtime, size and inode are
+    unchanged, so the UI can call this as often as it likes.
+    """
+    stat = _config_stat()
+    if stat is None or stat != _config_cache["stat"]:
+        config = _copy_config(DEFAULT_CONFIG)
+        if stat is not None:
+            try:
+                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                    config.update(json.load(f))
+            except Exception:
+                config = _copy_config(DEFAULT_CONFIG)
+        if config.get("storage") not in STORAGE_ENGINES:
+            config["storage"] = "json"
+        
+        # Ensure current focus is in focuses list
+        if config["current_focus"] not in config["focuses"]:
+            config["focuses"].append(config["current_focus"])
+        
+        _config_cache["stat"] = stat
+        _config_cache["config"] = config
+    
+    config = _config_cache["config"]
+    _apply_config_theme(config)
+    return _copy_config(config)
+
+def merge_config(base, ours, theirs):
+    """Three-way merge: apply the keys changed from base to ours onto theirs
+
+    List values (focuses) merge item-wise, so focuses added or removed by
+    two processes at once are all kept.
+    """
+    merged = dict(theirs)
+    for key, value in ours.items():
+        if base.get(key) == value:
+            continue  # Not changed here - keep whatever is on disk
+        if isinstance(value, list) and isinstance(base.get(key), list) and isinstance(theirs.get(key), list):
+            removed = set(base[key]) - set(value)
+            added = [v for v in value if v not in base[key] and v not in theirs[key]]
+            merged[key] = [v for v in theirs[key] if v not in removed] + added
+        else:
+            merged[key] = value
+    return merged
+
+def save_config(config):
+    """Save configuration, writing through to the config cache
+
+    If another process rewrote config.json since it was loaded here, only
+    the settings changed here are applied on top of the file's contents.
+    """
+    ensure_data_dir()
+    try:
+        with data_lock():
+            backup_data()  # Backup before saving
+            base = _config_cache["config"]
+            if base is not None and _config_stat() != _config_cache["stat"]:
+                theirs = _copy_config(DEFAULT_CONFIG)
+                theirs.update(_read_json(CONFIG_FILE, {}))
+                config = merge_config(base, config, theirs)
+            atomic_write(CONFIG_FILE, json.dumps(config, ensure_ascii=False, indent=2))
+            _config_cache["stat"] = _config_stat()
+            _config_cache["config"] = _copy_config(config)
+    except Exception as e:
+        print(f"{G.RED}Error saving config: {e}{G.END}")
+
+# Backups
+#
+# Backups are generations of the data files stored as content-addressed
+# chunks under backups/objects/, with one small manifest per generation
+# in backups/generations/. Chunks are cut on line boundaries chosen by
+# line content, so an edit only produces new chunks around the changed
+# lines and everything else is shared with earlier generations.
+
+BACKUP_MIN_INTERVAL = 300  # Seconds between generations...
+BACKUP_MIN_CHANGES = 25    # ...unless this many saves piled up first
+BACKUP_KEEP = 50           # Generations kept before the oldest are pruned
+BACKUP_CHUNK_MASK = 0x1f   # Cut after lines whose crc32 & mask == 0 (~32 lines)
+BACKUP_CHUNK_MAX = 64 * 1024
+
+def backup_files():
+    """Data files that make up one backup generation"""
+    files = [TODO_FILE, JOURNAL_FILE, TODO_DB, PACK_FILE, CONFIG_FILE]
+    if SHARD_DIR.exists():
+        files.extend(sorted(SHARD_DIR.glob("*.json")))
+    return files
+
+def _backup_name(path):
+    return path.relative_to(DATA_DIR).as_posix()
+
+def _backup_dir():
+    return DATA_DIR / "backups"
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def _write_json(path, data):
+    atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+def split_chunks(data):
+    """Split bytes into content-defined chunks on line boundaries"""
+    import zlib
+    chunks = []
+    start = 0
+    pos = 0
+    length = len(data)
+    while pos < length:
+        end = data.find(b'\n', pos)
+        end = length if end == -1 else end + 1
+        if end - start > BACKUP_CHUNK_MAX:
+            # Very long line (or binary data) - fall back to fixed-size pieces
+            end = start + BACKUP_CHUNK_MAX
+            chunks.append(data[start:end])
+            start = end
+        elif zlib.crc32(data[pos:end]) & BACKUP_CHUNK_MASK == 0 or end == length:
+            chunks.append(data[start:end])
+            start = end
+        pos = end
+    return chunks
+
+def _store_chunk(objects_dir, chunk):
+    """Store a chunk once, return its hash"""
+    import hashlib
+    import zlib
+    digest = hashlib.sha1(chunk).hexdigest()
+    path = objects_dir / digest[:2] / digest
+    if not path.exists():
+        path.parent.mkdir(exist_ok=True, parents=True)
+        atomic_write(path, zlib.compress(chunk))
+    return digest
+
+def list_backups():
+    """Return the manifests of all backup generations, oldest first"""
+    gen_dir = _backup_dir() / "generations"
+    if not gen_dir.exists():
+        return []
+    manifests = [_read_json(p, None) for p in gen_dir.glob("*.json")]
+    return sorted((m for m in manifests if m), key=lambda m: m["id"])
+
+_backups = {"changes": 0, "reported": False}  # Saves since this process' last generation
+
+def backup_data(force=False):
+    """Record a backup generation of todos and config, throttled
+
+    A new generation is taken once BACKUP_MIN_INTERVAL seconds have
+    passed since the last one - the mtime of backups/state.json, which
+    is only written with a generation - or this process saved
+    BACKUP_MIN_CHANGES times since. Other calls cost a single stat. A
+    generation only writes the chunks no earlier one already stored.
+    """
+    backup_dir = _backup_dir()
+    state_file = backup_dir / "state.json"
+    _backups["changes"] += 1
+    
+    try:
+        with data_lock():  # Normally held already, by the save
+            stat = file_stat(state_file)
+            if (stat is not None and not force and _backups["changes"] < BACKUP_MIN_CHANGES
+                    and time.time() - stat[0] / 1e9 < BACKUP_MIN_INTERVAL):
+                return
+            state = _read_json(state_file, {"next_id": 1, "last_time": 0})
+            backup_dir.mkdir(exist_ok=True, parents=True)
+            if _take_generation(backup_dir, state, time.time()):
+                _write_json(state_file, state)
+                _backups["changes"] = 0
+    except Exception as e:
+        # The save goes ahead either way, but a failing backup must not go
+        # unnoticed - say so once per run rather than on every save
+        if not _backups["reported"]:
+            _backups["reported"] = True
+            sys.stderr.write(f"ghosty: backup failed: {type(e).__name__}: {e}\n")
+
+def _take_generation(backup_dir, state, now):
+    """Write a generation and advance state; False if there was nothing to back up"""
+    from datetime import datetime
+    objects_dir = backup_dir / "objects"
+    gen_dir = backup_dir / "generations"
+    gen_dir.mkdir(exist_ok=True, parents=True)
+    if _db is not None:
+        _db.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # Settle todos.db first
+    
+    previous = _read_json(gen_dir / f"{state['next_id'] - 1}.json", {"files": {}})
+    files = {}
+    for path in backup_files():
+        if not path.exists():
+            continue
+        st = path.stat()
+        stat = [st.st_mtime_ns, st.st_size]
+        name = _backup_name(path)
+        old = previous["files"].get(name)
+        if old and old["stat"] == stat:
+            files[name] = old  # Untouched since the last generation
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        files[name] = {
+            "stat": stat,
+            "chunks": [_store_chunk(objects_dir, c) for c in split_chunks(data)]
+        }
+    
+    if not files:
+        return False  # Nothing to back up yet
+    
+    manifest = {
+        "id": state["next_id"],
+        "created": datetime.fromtimestamp(now).isoformat(),
+        "files": files
+    }
+    _write_json(gen_dir / f"{manifest['id']}.json", manifest)
+    state["next_id"] += 1
+    state["last_time"] = now
+    
+    if manifest["id"] > BACKUP_KEEP:
+        prune_backups(backup_dir)
+    return True
+
+def prune_backups(backup_dir):
+    """Drop generations beyond BACKUP_KEEP and chunks nobody references"""
+    manifests = list_backups()
+    for old in manifests[:-BACKUP_KEEP]:
+        (backup_dir / "generations" / f"{old['id']}.json").unlink()
+    live = set()
+    for manifest in manifests[-BACKUP_KEEP:]:
+        for entry in manifest["files"].values():
+            live.update(entry["chunks"])
+    for path in (backup_dir / "objects").glob("*/*"):
+        if path.name not in live:
+            path.unlink()
+
+def restore_backup(gen_id):
+    """Restore the data files of a backup generation
+
+    The current state is recorded as a new generation first, so a restore
+    can itself be undone.
+    """
+    backup_dir = _backup_dir()
+    manifest = _read_json(backup_dir / "generations" / f"{gen_id}.json", None)
+    if manifest is None:
+        raise ValueError(f"No backup generation {gen_id}")
+    
+    backup_data(force=True)
+    wait_for_compaction()
+    close_db()
+    for suffix in ('-wal', '-shm'):
+        stale = TODO_DB.with_name(TODO_DB.name + suffix)
+        if stale.exists():
+            stale.unlink()
+    with data_lock():
+        for path in backup_files():
+            # Not part of that generation (e.g. no journal back then)
+            if _backup_name(path) not in manifest["files"] and path.exists():
+                path.unlink()
+        for name, entry in manifest["files"].items():
+            path = DATA_DIR / name
+            path.parent.mkdir(exist_ok=True, parents=True)
+            atomic_write(path, read_backup_file(entry))
+    return manifest
+
+def read_backup_file(entry):
+    """Reassemble one file of a backup generation from its chunks"""
+    import zlib
+    objects_dir = _backup_dir() / "objects"
+    parts = []
+    for digest in entry["chunks"]:
+        with open(objects_dir / digest[:2] / digest, 'rb') as src:
+            parts.append(zlib.decompress(src.read()))
+    return b''.join(parts)
+
+def load_backup_todos(gen_id):
+    """Todos stored in a backup generation, read the way its engine wrote them"""
+    manifest = _read_json(_backup_dir() / "generations" / f"{gen_id}.json", None)
+    if manifest is None:
+        raise ValueError(f"No backup generation {gen_id}")
+    files = manifest["files"]
+    
+    def read(name):
+        return read_backup_file(files[name]).decode('utf-8')
+    
+    engine = "json"
+    if CONFIG_FILE.name in files:
+        engine = json.loads(read(CONFIG_FILE.name)).get("storage", "json")
+    
+    todos = []
+    if engine == "sharded":
+        for name in files:
+            if name.startswith(SHARD_DIR.name + '/') and not name.endswith('/manifest.json'):
+                todos.extend(loads_json(read(name)))
+    elif engine == "sqlite":
+        raise ValueError(f"Backup {gen_id} already uses sqlite - use ghosty restore")
+    elif engine == "packed":
+        if PACK_FILE.name in files:
+            todos = decode_pack(read_backup_file(files[PACK_FILE.name]))
+    else:
+        if TODO_FILE.name in files:
+            todos = loads_json(read(TODO_FILE.name))
+        if JOURNAL_FILE.name in files:
+            lines = read(JOURNAL_FILE.name).splitlines()
+            todos = apply_ops(todos, (loads_json(line) for line in lines if line.strip()))
+    return todos
+
+# Import / Export
+#
+# Todos stream in and out as JSON Lines, CSV, a JSON list or plain text
+# (one todo per line). An import is validated up front and committed as
+# a single batch of 'add' records - one storage write however many todos
+# it holds - and todos whose id already exists are skipped, so importing
+# an export again doesn't duplicate anything.
+
+TRANSFER_FORMATS = ["jsonl", "csv", "json", "text"]
+EXPORT_FIELDS = ["id", "text", "status", "focus", "created"]
+
+def guess_format(filename, default="jsonl"):
+    """Transfer format from a file extension"""
+    suffix = Path(filename).suffix.lower().lstrip('.')
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix in ("csv", "json"):
+        return suffix
+    if suffix == "txt":
+        return "text"
+    return default
+
+def _read_records(f, fmt):
+    """Yield (line number, raw record) pairs from an open text file"""
+    import csv
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "json":
+        for number, record in enumerate(json.load(f), 1):
+            yield number, record
+    else:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if fmt == "text":
+                yield number, {"text": line}
+            else:
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    yield number, None
+
+def validate_todo(record, focus):
+    """Turn an imported record into a todo, or raise ValueError"""
+    from datetime import datetime
+    if not isinstance(record, dict):
+        raise ValueError("not a todo record")
+    text = str(record.get("text") or '').strip()
+    if not text:
+        raise ValueError("missing text")
+    status = record.get("status") or "pending"
+    if status not in TODO_STATUSES:
+        raise ValueError(f"unknown status '{status}'")
+    todo = new_todo(text, record.get("focus") or focus)
+    todo["status"] = status
+    if record.get("created"):
+        try:
+            created_ts = int(datetime.fromisoformat(record["created"]).timestamp())
+        except (ValueError, TypeError, OverflowError, OSError):
+            raise ValueError("invalid created date")
+        todo["created"] = record["created"]
+        todo["created_ts"] = created_ts
+    if record.get("id"):
+        todo["id"] = str(record["id"])
+    return todo
+
+def import_todos(f, fmt, focus):
+    """Validate and commit every todo in f with one storage write
+
+    Records whose id is already stored (or came earlier in f) are
+    skipped, so re-importing an export is harmless. Returns (imported
+    count, list of (line, error) for invalid records, list of (line, id)
+    for duplicates).
+    """
+    ops = []
+    errors = []
+    duplicates = []
+    seen = set(todo.get("id") for todo in iter_todos())  # Skip todos already stored
+    focuses = []
+    for number, record in _read_records(f, fmt):
+        try:
+            todo = validate_todo(record, focus)
+        except (ValueError, TypeError) as e:
+            errors.append((number, str(e) if record is not None else "invalid JSON"))
+            continue
+        if todo["id"] in seen:
+            duplicates.append((number, todo["id"]))
+            continue
+        seen.add(todo["id"])
+        if todo["focus"] not in focuses:
+            focuses.append(todo["focus"])
+        ops.append(make_op('add', todo))
+    
+    commit_todos(None, ops)
+    config = load_config()
+    new_focuses = [f for f in focuses if f not in config["focuses"]]
+    if new_focuses:
+        config["focuses"].extend(new_focuses)
+        save_config(config)
+    return len(ops), errors, duplicates
+
+def iter_todos(focus=None):
+    """Yield stored todos without holding more than the engine needs
+
+    The sqlite engine streams rows and the sharded engine one shard at a
+    time; the json and journal engines have to load their file first.
+    """
+    engine = storage_engine()
+    if engine == "sqlite":
+        for todo in iter_db(focus):
+            yield todo
+    elif engine == "sharded" and focus is None:
+        for name in _load_shard_manifest()["shards"].values():
+            for todo in _read_shard(SHARD_DIR / name):
+                yield todo
+    else:
+        for todo in load_todos(focus):
+            yield todo
+
+def export_todos(f, fmt, focus=None):
+    """Stream stored todos into f, return how many were written"""
+    import csv
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+    elif fmt == "json":
+        f.write('[')
+    for todo in iter_todos(focus):
+        if fmt == "csv":
+            writer.writerow(todo)
+        elif fmt == "text":
+            f.write(todo.get('text', '') + '\n')
+        else:
+            line = json.dumps(todo, ensure_ascii=False, separators=(',', ':'), default=todo_json)
+            if fmt == "json":
+                f.write((',\n' if count else '\n') + line)
+            else:
+                f.write(line + '\n')
+        count += 1
+    if fmt == "json":
+        f.write('\n]\n')
+    return count
+
+# Ages are bucketed into minutes, hours and days; the labels of the
+# minute and hour buckets are built once, day labels on first use
+_AGE_MINUTES = [f"{m}m" for m in range(60)]
+_AGE_HOURS = [f"{h}h" for h in range(24)]
+_age_days = {}
+
+def age_label(seconds):
+    """'now', '5m', '3h' or '2d' for an age in seconds"""
+    if seconds < 60:
+        return "now"
+    if seconds < 3600:
+        return _AGE_MINUTES[seconds // 60]
+    if seconds < 86400:
+        return _AGE_HOURS[seconds // 3600]
+    days = seconds // 86400
+    label = _age_days.get(days)
+    if label is None:
+        label = _age_days[days] = f"{days}d"
+    return label
+
+def todo_age(todo, now):
+    """Age label of a todo at epoch second now, '' without a valid date"""
+    created = todo.get('created_ts')
+    if created is None:
+        created = todo_timestamp(todo.get('created'))  # Not migrated yet
+        if created is None:
+            return ""
+    return age_label(now - created)
+
+
+# Settings Menus
+
+def themes_menu():
+    """Themes selection menu"""
+    while True:
+        config = load_config()
+        current_theme = config.get("theme", "Ghosty Classic")
+        
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ THEMES ]{G.END}")
+        
+        # List available themes
+        themes = list(THEMES.keys())
+        for idx, theme in enumerate(themes, 1):
+            star = f" {G.YELLOW}★{G.END}" if theme == current_theme else ""
+            print(f"{G.CYAN_FAINT}{idx}.{G.END} {G.WHITE}{theme}{star}{G.END}")
+        
+        print()
+        print(f"{G.CYAN_FAINT}[s]{G.END} select {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[b]{G.END} back")
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 's':
+            try:
+                idx = int(input(f"{G.CYAN_FAINT}Select theme number:{G.END} ").strip()) - 1
+                if 0 <= idx < len(themes):
+                    selected = themes[idx]
+                    config["theme"] = selected
+                    save_config(config)
+                    show_success(f"✔ Theme set to: {selected}")
+                else:
+                    show_error("✖ Invalid theme number")
+            except (ValueError, IndexError):
+                show_error("✖ Invalid input")
+        
+        elif choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+def appearance_menu():
+    """Appearance settings menu"""
+    while True:
+        config = load_config()
+        
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ APPEARANCE ]{G.END}")
+        
+        alternate_banner = config.get("alternate_banner", False)
+        hide_banner = config.get("hide_banner", False)
+        
+        print(f"{G.CYAN_FAINT}1.{G.END} Alternate Banner: {G.HAUNTED_GREEN if alternate_banner else G.RED}{'ON' if alternate_banner else 'OFF'}{G.END}")
+        print(f"{G.CYAN_FAINT}2.{G.END} Hide Banner in Menus: {G.HAUNTED_GREEN if hide_banner else G.RED}{'ON' if hide_banner else 'OFF'}{G.END}")
+        
+        print()
+        print(f"{G.CYAN_FAINT}[s]{G.END} select {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[b]{G.END} back")
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 's':
+            try:
+                option = int(input(f"{G.CYAN_FAINT}Select option number:{G.END} ").strip())
+                if option == 1:
+                    config["alternate_banner"] = not config.get("alternate_banner", False)
+                    status = "ON" if config["alternate_banner"] else "OFF"
+                    show_success(f"✔ Alternate Banner: {status}")
+                elif option == 2:
+                    config["hide_banner"] = not config.get("hide_banner", False)
+                    status = "ON" if config["hide_banner"] else "OFF"
+                    show_success(f"✔ Hide Banner: {status}")
+                else:
+                    show_error("✖ Invalid option")
+                save_config(config)
+            except ValueError:
+                show_error("✖ Invalid input")
+        
+        elif choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+def preferences_menu():
+    """Preferences settings menu"""
+    while True:
+        config = load_config()
+        
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ PREFERENCES ]{G.END}")
+        
+        reprint_list = config.get("reprint_list", True)
+        show_responses = config.get("show_responses", True)
+        storage = config.get("storage", "json")
+        
+        print(f"{G.CYAN_FAINT}1.{G.END} Reprint list after CLI commands: {G.HAUNTED_GREEN if reprint_list else G.RED}{'ON' if reprint_list else 'OFF'}{G.END}")
+        print(f"{G.CYAN_FAINT}2.{G.END} Show success responses: {G.HAUNTED_GREEN if show_responses else G.RED}{'ON' if show_responses else 'OFF'}{G.END}")
+        print(f"{G.CYAN_FAINT}3.{G.END} Storage engine: {G.HAUNTED_GREEN}{storage}{G.END}")
+        
+        print()
+        print(f"{G.CYAN_FAINT}[s]{G.END} select {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[b]{G.END} back")
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 's':
+            try:
+                option = int(input(f"{G.CYAN_FAINT}Select option number:{G.END} ").strip())
+                if option == 1:
+                    config["reprint_list"] = not config.get("reprint_list", True)
+                    status = "ON" if config["reprint_list"] else "OFF"
+                    show_success(f"✔ Reprint list: {status}")
+                    save_config(config)
+                elif option == 2:
+                    config["show_responses"] = not config.get("show_responses", True)
+                    status = "ON" if config["show_responses"] else "OFF"
+                    show_success(f"✔ Show responses: {status}", force_show=True)
+                    save_config(config)
+                elif option == 3:
+                    # Cycle engines; fold the data into a fresh snapshot on the way
+                    engines = STORAGE_ENGINES
+                    switch_storage(config, engines[(engines.index(storage) + 1) % len(engines)])
+                    show_success(f"✔ Storage engine: {config['storage']}")
+                else:
+                    show_error("✖ Invalid option")
+            except ValueError:
+                show_error("✖ Invalid input")
+            except StorageError as e:
+                show_error(f"✖ {e}")
+        
+        elif choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+def help_menu():
+    """Display help information"""
+    while True:
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ HELP ]{G.END}")
+        
+        print(f"{G.WHITE}{G.BOLD}Interactive Mode:{G.END}")
+        print(f"  {G.CYAN_FAINT}[1]{G.END} To-Do List")
+        print(f"  {G.CYAN_FAINT}[2]{G.END} Edit Focuses")
+        print(f"  {G.CYAN_FAINT}[3]{G.END} Settings")
+        print(f"  {G.CYAN_FAINT}[0]{G.END} Exit")
+        
+        print(f"\n{G.WHITE}{G.BOLD}To-Do List Commands:{G.END}")
+        print(f"  {G.CYAN_FAINT}[a]{G.END} Add new todo")
+        print(f"  {G.CYAN_FAINT}[c]{G.END} Check/uncheck todo(s)")
+        print(f"  {G.CYAN_FAINT}[h]{G.END} Hold/unhold todo(s)")
+        print(f"  {G.CYAN_FAINT}[r]{G.END} Remove todo(s)")
+        print(f"  {G.CYAN_FAINT}[m]{G.END} Move todo(s) to another focus")
+        print(f"  {G.CYAN_FAINT}[/]{G.END} Search the list (empty shows all)")
+        print(f"  {G.CYAN_FAINT}[n]{G.END} Next page")
+        print(f"  {G.CYAN_FAINT}[p]{G.END} Previous page")
+        print(f"  {G.CYAN_FAINT}[b]{G.END} Back to main menu")
+        
+        print(f"\n{G.WHITE}{G.BOLD}CLI Commands:{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty list [--page N] [--limit N]{G.END} (or ls)")
+        print(f"  {G.CYAN_FAINT}ghosty add <text>{G.END} (or a)")
+        print(f"  {G.CYAN_FAINT}ghosty check <numbers>{G.END} (or c)")
+        print(f"  {G.CYAN_FAINT}ghosty hold <numbers>{G.END} (or h)")
+        print(f"  {G.CYAN_FAINT}ghosty remove <numbers>{G.END} (or r/rm)")
+        print(f"  {G.CYAN_FAINT}ghosty move <numbers> --to <focus>{G.END} (or mv)")
+        print(f"  {G.CYAN_FAINT}ghosty mark <pending|done|on-hold> <numbers>{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty search <words> [--focus F | --all] [--status S]{G.END} (or s)")
+        print(f"  {G.CYAN_FAINT}ghosty import [file]{G.END} (jsonl, csv, json or text)")
+        print(f"  {G.CYAN_FAINT}ghosty export [file]{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty backups{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty restore <generation>{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty sqlite-import [--backup <source>]{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty convert <source> <dest>{G.END} (todos.json <-> .pack)")
+        print(f"  {G.CYAN_FAINT}ghosty daemon [--stop]{G.END} (serve later commands from memory)")
+        
+        print(f"\n{G.WHITE}{G.BOLD}Number Formats:{G.END}")
+        print(f"  Single: {G.CYAN_FAINT}1{G.END}")
+        print(f"  Multiple: {G.CYAN_FAINT}1 3 5{G.END}")
+        print(f"  Ranges: {G.CYAN_FAINT}1-5{G.END} or {G.CYAN_FAINT}3-5 7 9-11{G.END}")
+        print(f"  Open ranges: {G.CYAN_FAINT}5-{G.END} (5 to the last todo)")
+        print(f"  Steps: {G.CYAN_FAINT}1-20/2{G.END} (every other todo from 1 to 20)")
+        print(f"  From the end: {G.CYAN_FAINT}-1{G.END} (the last todo), {G.CYAN_FAINT}-3-{G.END} (the last three), {G.CYAN_FAINT}-5--2{G.END} (fifth to second last)")
+        
+        print(f"\n{G.WHITE}{G.BOLD}Examples:{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty check 1 3-5{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty remove 2 4-6{G.END}")
+        print(f"  {G.CYAN_FAINT}ghosty add \"Buy groceries\"{G.END}")
+        print(f"  {G.CYAN_FAINT}NO_COLOR=1 ghosty list{G.END} (no colours, even on a terminal)")
+        
+        print()
+        print(f"{G.CYAN_FAINT}[b]{G.END} back")
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+def settings_menu():
+    """Main settings menu"""
+    while True:
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ SETTINGS ]{G.END}")
+        
+        print(f"{G.HAUNTED_GREEN}[1]{G.END}  Themes")
+        print(f"{G.HAUNTED_GREEN}[2]{G.END}  Appearance")
+        print(f"{G.HAUNTED_GREEN}[3]{G.END}  Preferences")
+        print(f"{G.HAUNTED_GREEN}[4]{G.END}  Help")
+        print(f"{G.RED}[b]{G.END}  Back to Main Menu")
+        
+        print()
+        choice = status_input(f"{G.BOLD}{G.CYAN_FAINT}settings>{G.END} ").strip().lower()
+        
+        if choice == '1':
+            themes_menu()
+        elif choice == '2':
+            appearance_menu()
+        elif choice == '3':
+            preferences_menu()
+        elif choice == '4':
+            help_menu()
+        elif choice == 'b':
+            break
+        else:
+            show_error("✖ Invalid choice")
+
+
+# Focuses Menu
+
+def edit_focuses_menu():
+    """Interactive focuses management menu"""
+    while True:
+        config = load_config()
+        current_focus = config.get("current_focus", "default")
+        focuses = config.get("focuses", ["default"])
+        
+        begin_frame()
+        print_banner()
+        print(f"\n{G.BOLD}{G.GHOST_PURPLE}[ FOCUSES ]{G.END}")
+        
+        # Display focuses
+        for idx, focus in enumerate(focuses, 1):
+            star = f" {G.YELLOW}★{G.END}" if focus == current_focus else ""
+            print(f"{G.CYAN_FAINT}{idx}.{G.END} {G.WHITE}{focus}{star}{G.END}")
+        
+        # Menu
+        print()
+        print(f"{G.CYAN_FAINT}[a]{G.END} add {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[r]{G.END} remove {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[s]{G.END} select {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[b]{G.END} back")
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 'a':
+            name = input(f"{G.CYAN_FAINT}Focus name:{G.END} ").strip()
+            if name:
+                if name in focuses:
+                    show_error(f"✖ Focus '{name}' already exists")
+                else:
+                    focuses.append(name)
+                    config["focuses"] = focuses
+                    save_config(config)
+                    show_success(f"✔ Added focus: {name}")
+            else:
+                show_error("✖ Focus name cannot be empty")
+        
+        elif choice == 'r':
+            try:
+                idx = int(input(f"{G.CYAN_FAINT}Focus number:{G.END} ").strip()) - 1
+                if 0 <= idx < len(focuses):
+                    focus_to_remove = focuses[idx]
+                    if focus_to_remove == "default":
+                        show_error("✖ Cannot remove default focus")
+                    else:
+                        # Check if it's the current focus
+                        if focus_to_remove == current_focus:
+                            config["current_focus"] = "default"
+                        
+                        # Remove the todos first: a failed drop leaves the focus listed
+                        drop_focus(focus_to_remove)
+                        
+                        focuses.remove(focus_to_remove)
+                        config["focuses"] = focuses
+                        save_config(config)
+                        
+                        show_success(f"✔ Removed focus: {focus_to_remove}")
+                else:
+                    show_error("✖ Invalid focus number")
+            except (ValueError, IndexError):
+                show_error("✖ Invalid input")
+            except StorageError as e:
+                show_error(f"✖ {e}")
+        
+        elif choice == 's':
+            try:
+                idx = int(input(f"{G.CYAN_FAINT}Select focus number:{G.END} ").strip()) - 1
+                if 0 <= idx < len(focuses):
+                    selected = focuses[idx]
+                    config["current_focus"] = selected
+                    save_config(config)
+                    show_success(f"✔ Selected focus: @{selected}")
+                else:
+                    show_error("✖ Invalid focus number")
+            except (ValueError, IndexError):
+                show_error("✖ Invalid input")
+        
+        elif choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+
+# Todo List UI
+
+# One todo number selector: 3, 3-7, 5-, -1, -3-, 1-20/2
+NUMBER_SELECTOR = r"^(-?\d+)(?:(-)(-?\d+)?)?(?:/(\d+))?$"
+
+def _span(first, last):
+    return str(first) if first == last else f"{first}-{last}"
+
+class NumberRanges:
+    """Todo numbers as typed, kept as ranges until resolved against a list
+
+    Each selector is (first, last, step, text): last None means open
+    ended ("5-") and negative numbers count from the end ("-1" is the
+    last todo). Resolving clamps every range to the list first, so
+    "1-100000000" costs no more than "1-3".
+    """
+    
+    def __init__(self, selectors=()):
+        self.selectors = list(selectors)
+    
+    def __bool__(self):
+        return bool(self.selectors)
+    
+    def resolve(self, count):
+        """(ranges, invalid) for a list of count todos
+        
+        ranges hold the valid numbers, overlapping step-1 ranges merged;
+        invalid labels the selected numbers outside 1..count.
+        """
+        plain, stepped, invalid = [], [], []
+        for typed_first, typed_last, step, text in self.selectors:
+            first = typed_first + count + 1 if typed_first < 0 else typed_first
+            if typed_last is None:
+                last = count
+            else:
+                last = typed_last + count + 1 if typed_last < 0 else typed_last
+            if first > last:
+                continue
+            if first < 1:
+                below = min(last, 0) - first  # How many numbers fall below 1
+                invalid.append(_span(typed_first, typed_first + below) if typed_first < 0 else "0")
+                first += -(-(1 - first) // step) * step
+            if last > count:
+                over = first + max(0, -(-(count + 1 - first) // step)) * step
+                if over <= last:
+                    invalid.append(_span(over, last))
+                last = count
+            if first <= last:
+                (plain if step == 1 else stepped).append(range(first, last + 1, step))
+        merged = []
+        for r in sorted(plain, key=lambda r: r.start):
+            if merged and r.start <= merged[-1].stop:
+                merged[-1] = range(merged[-1].start, max(merged[-1].stop, r.stop))
+            else:
+                merged.append(r)
+        return merged + stepped, invalid
+    
+    def descending(self, count):
+        """Valid numbers for a list of count todos, highest first, each once"""
+        import heapq
+        ranges, _ = self.resolve(count)
+        previous = None
+        for number in heapq.merge(*(reversed(r) for r in ranges), reverse=True):
+            if number != previous:
+                yield number
+                previous = number
+    
+    def invalid(self, count):
+        """Labels of the selected numbers a list of count todos doesn't have"""
+        return self.resolve(count)[1]
+
+def parse_numbers(input_str):
+    """Parse comma-separated or space-separated numbers, including ranges
+    
+    Besides 3 and 3-7 this takes open ranges (5-), steps (1-20/2) and
+    numbers from the end (-1 is the last todo, -3- the last three).
+    Anything else is skipped.
+    """
+    selectors = []
+    for part in input_str.replace(',', ' ').split():
+        match = re.match(NUMBER_SELECTOR, part)
+        if not match or match.group(4) == '0':
+            continue
+        first = int(match.group(1))
+        if match.group(2) is None:
+            last = first
+        elif match.group(3) is None:
+            last = None
+        else:
+            last = int(match.group(3))
+        selectors.append((first, last, int(match.group(4) or 1), part))
+    return NumberRanges(selectors)
+
+def todo_row(number, item, show_focus=False, now=None):
+    """One numbered todo as a list line, aged at epoch second now"""
+    status = item.get('status', 'pending')
+    if status == 'done':
+        symbol = '✔'
+        color = G.HAUNTED_GREEN
+    elif status == 'on-hold':
+        symbol = '●'
+        color = G.YELLOW
+    else:
+        symbol = '☐'
+        color = G.WHITE
+    
+    text = item.get('text', '')
+    age = todo_age(item, int(time.time()) if now is None else now)
+    age_display = f" {G.DARK_GREY}{age}{G.END}" if age else ""
+    focus_display = f" {G.DARK_GREY}@{item.get('focus')}{G.END}" if show_focus else ""
+    
+    return f"   {G.CYAN_FAINT}{number}.{G.END} {color}{symbol} {text}{age_display}{focus_display}{G.END}"
+
+def todo_list_frame(rows, current_focus, counts, show_banner=True, pager=None, paging=False):
+    """The todo list screen as a list of lines, one per terminal row
+
+    rows are the visible (number, todo) pairs only and counts holds the
+    status counts of the whole focus. pager is a line shown below the
+    rows, and paging adds the page keys to the menu.
+    """
+    lines = []
+    if show_banner:
+        lines.extend(banner_lines())
+        lines.append("")
+        lines.append(f"{G.BOLD}{G.GHOST_PURPLE}[ TO-DO LIST ]{G.END}")
+    
+    # Calculate stats
+    total = sum(counts.values())
+    done = counts.get('done', 0)
+    on_hold = counts.get('on-hold', 0)
+    pending = total - done - on_hold
+    
+    # Header with focus and stats
+    stats = f"[{done}/{total}]" if total > 0 else "[0/0]"
+    lines.append(f"{G.WHITE}@{current_focus}{G.END} {G.DARK_GREY}{stats}{G.END}")
+    
+    # Display todos
+    if not total:
+        lines.append(f"   {G.LIGHT_GREY}(no todos yet){G.END}")
+    else:
+        now = int(time.time())  # One clock read for the whole page
+        lines.extend(todo_row(number, item, False, now) for number, item in rows)
+    if pager and total:
+        lines.append(f"   {G.DARK_GREY}{pager}{G.END}")
+    
+    # Stats summary
+    lines.append("")
+    if total > 0:
+        percentage = int((done / total) * 100) if total > 0 else 0
+        lines.append(f"   {G.LIGHT_GREY}{percentage}% of all tasks complete.{G.END}")
+        lines.append(f"   {G.HAUNTED_GREEN}{done} done{G.END} {G.LIGHT_GREY}•{G.END} {G.YELLOW}{on_hold} on-hold{G.END} {G.LIGHT_GREY}•{G.END} {G.WHITE}{pending} pending{G.END}")
+    
+    # Menu
+    if show_banner:
+        lines.append("")
+        lines.append(f"{G.CYAN_FAINT}[a]{G.END} add {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[c]{G.END} check/uncheck {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[h]{G.END} hold {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[r]{G.END} remove {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[b]{G.END} back")
+        keys = f"{G.CYAN_FAINT}[m]{G.END} move {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[/]{G.END} search"
+        if paging:
+            keys += f" {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[n]{G.END} next {G.LIGHT_GREY}•{G.END} {G.CYAN_FAINT}[p]{G.END} prev"
+        lines.append(keys)
+    
+    return lines
+
+def page_label(page, pages, rows, total):
+    """Pager line for one page of rows out of total"""
+    if not rows:
+        return f"page {page}/{pages}"
+    return f"page {page}/{pages} - {rows[0][0]}-{rows[-1][0]} of {total}"
+
+def list_page_size():
+    """Todo rows that fit on the terminal below the banner and menu"""
+    try:
+        height = os.get_terminal_size(sys.stdout.fileno()).lines
+    except (OSError, ValueError):
+        height = 24
+    # Title, header, pager, stats and menu lines plus the prompt area
+    return max(5, height - len(banner_lines()) - 18)
+
+def show_todo_page(todos, current_focus, page, query=None):
+    """Draw one terminal-high page of the todo list, return the page shown
+
+    Only the visible rows are formatted, so a 20k todo focus redraws as
+    fast as a short one. With a query only the matching todos are listed,
+    still under their list numbers.
+    """
+    limit = list_page_size()
+    rows = list(enumerate(todos, 1))
+    if query:
+        ids = search_index().search(query, current_focus)
+        rows = [row for row in rows if row[1]['id'] in ids]
+    page, pages, start = page_window(len(rows), page, limit)
+    visible = rows[start:start + limit]
+    pager = page_label(page, pages, visible, len(rows)) if pages > 1 else None
+    if query:
+        pager = f"{len(rows)} match{'es' if len(rows) != 1 else ''} for \"{query}\"{f' ({pager})' if pager else ''} - [/] then enter shows all"
+    draw_frame(todo_list_frame(visible, current_focus, status_counts(todos), True, pager, pages > 1))
+    return page
+
+def display_todo_list(show_banner=True, page=None, limit=None):
+    """Display the todo list with all formatting
+
+    With the banner (the interactive menu) the first page becomes the
+    next screen frame. Without it (the CLI) the list is printed, one page
+    of limit todos when page or limit is given.
+    """
+    config = load_config()
+    current_focus = config.get("current_focus", "default")
+    if show_banner:
+        todos = load_todos(current_focus)
+        show_todo_page(todos, current_focus, page or 1)
+        return todos
+    if page is None and limit is None:
+        todos = load_todos(current_focus)
+        lines = todo_list_frame(list(enumerate(todos, 1)), current_focus, status_counts(todos), False)
+    else:
+        visible, counts, page, pages, start = load_todo_page(current_focus, page or 1, limit or list_page_size())
+        rows = list(enumerate(visible, start + 1))
+        lines = todo_list_frame(rows, current_focus, counts, False, page_label(page, pages, rows, sum(counts.values())))
+    sys.stdout.write(''.join(line + '\n' for line in lines))
+
+def todo_list_menu():
+    """Interactive todo list menu with multi-command support"""
+    config = load_config()
+    current_focus = config.get("current_focus", "default")
+    
+    page = 1
+    query = None
+    while True:
+        todos = load_todos(current_focus)
+        index = TodoIndex(todos)
+        page = show_todo_page(todos, current_focus, page, query)
+        
+        choice = status_input(f"{G.CYAN_FAINT}choose:{G.END} ").strip().lower()
+        
+        if choice == 'a':
+            text = input(f"{G.CYAN_FAINT}New todo:{G.END} ").strip()
+            if text:
+                todo = new_todo(text, current_focus)
+                index.add(todo)
+                try:
+                    commit_todos(index.todos(), [make_op('add', todo)], focus=current_focus)
+                except StorageError as e:
+                    show_error(f"✖ {e}")
+                    continue
+                show_success(f"✔ Added: \"{text}\"")
+            else:
+                show_error("✖ Todo text cannot be empty")
+        
+        elif choice in ('c', 'h', 'r', 'm'):
+            action = {'c': 'check', 'h': 'hold', 'r': 'remove', 'm': 'move'}[choice]
+            numbers_input = input(f"{G.CYAN_FAINT}Todo number(s):{G.END} ").strip()
+            numbers = parse_numbers(numbers_input)
+            
+            if not numbers:
+                show_error("✖ No valid numbers provided")
+                continue
+            
+            target = None
+            if action == 'move':
+                target = input(f"{G.CYAN_FAINT}Move to focus:{G.END} ").strip()
+                if target not in load_config().get("focuses", []):
+                    show_error(f"✖ No focus named \"{target}\"")
+                    continue
+            
+            try:
+                summary = batch_mutate(index, todos, numbers, action, current_focus, target)
+            except StorageError as e:
+                show_error(f"✖ {e}")
+                continue
+            show_batch_summary(summary["counts"], summary["invalid"])
+        
+        elif choice == '/':
+            query = input(f"{G.CYAN_FAINT}Search:{G.END} ").strip() or None
+            page = 1
+        
+        elif choice == 'n':
+            page += 1
+        elif choice == 'p':
+            page -= 1
+        elif choice == 'b':
+            break
+        elif choice != '':
+            show_error("✖ Invalid choice")
+
+
+# Main Menu
+
+def main_menu():
+    """Display and handle main menu"""
+    while True:
+        begin_frame()
+        print_banner()
+        print()
+        print(f"{G.BOLD}{G.CYAN_FAINT}═══════════════════════════════════════════════════════{G.END}")
+        print(f"{G.HAUNTED_GREEN}[1]{G.END}  To-Do List")
+        print(f"{G.HAUNTED_GREEN}[2]{G.END}  Edit Focuses")
+        print(f"{G.HAUNTED_GREEN}[3]{G.END}  Settings")
+        print(f"{G.RED}[0]{G.END}  Exit")
+        print(f"{G.BOLD}{G.CYAN_FAINT}═══════════════════════════════════════════════════════{G.END}")
+        print()
+        
+        choice = status_input(f"{G.BOLD}{G.CYAN_FAINT}ghosty>{G.END} ").strip()
+        
+        if choice == '1':
+            todo_list_menu()
+        elif choice == '2':
+            edit_focuses_menu()
+        elif choice == '3':
+            settings_menu()
+        elif choice == '0':
+            goodbye_and_exit()
+        else:
+            show_error("✖ Invalid choice")
+
+def goodbye_and_exit():
+    """Exit with goodbye message"""
+    print(f"\n{G.GHOST_PURPLE}Thanks for using Ghosty - By AK! Stay spooky! 👻{G.END}\n")
+    sys.stdout.flush()
+    time.sleep(1.5)
+    clear()
+    set_terminal_title("Ghosty - By AK - Goodbye")
+    sys.exit(0)
+
+
+# Machine Output
+# --json, --porcelain and --quiet give scripts stable output: no colours,
+# terminal title or list reprints, just records and timings.
+
+_timings = {"phases": {"imports": round((IMPORTS_DONE - START_TIME) * 1000, 3)},
+            "start": START_TIME, "mark": IMPORTS_DONE}
+
+def reset_timings():
+    """Start timing a new command (the daemon serves many per process)"""
+    _timings["phases"] = {}
+    _timings["start"] = _timings["mark"] = time.perf_counter()
+
+def mark_timing(name):
+    """Record the milliseconds since the previous mark as phase name"""
+    now = time.perf_counter()
+    _timings["phases"][name] = round((now - _timings["mark"]) * 1000, 3)
+    _timings["mark"] = now
+
+def timing_report():
+    """Phase timings plus the total since ghosty was imported (or reset)"""
+    report = dict(_timings["phases"])
+    report["total"] = round((time.perf_counter() - _timings["start"]) * 1000, 3)
+    return report
+
+def machine_mode(args):
+    """Return 'json', 'tsv', 'quiet' or None for the normal styled output"""
+    if getattr(args, 'json', False):
+        return 'json'
+    if getattr(args, 'porcelain', False):
+        return 'tsv'
+    if getattr(args, 'quiet', False):
+        return 'quiet'
+    return None
+
+def todo_record(kind, n, todo):
+    """Flatten a todo into a machine output record, free text last"""
+    return {"type": kind, "n": n, "id": todo.get("id", ""), "status": todo.get("status", "pending"),
+            "focus": todo.get("focus", "default"), "created": todo.get("created", ""),
+            "text": todo.get("text", "")}
+
+def _tsv_field(value):
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+def emit_result(mode, records):
+    """Write records as one JSON object or as TSV lines (type first)"""
+    mark_timing("command")
+    if mode == 'json':
+        result = {"ok": True, "records": records, "timings": timing_report()}
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+    elif mode == 'tsv':
+        sys.stdout.write(''.join('\t'.join(_tsv_field(v) for v in record.values()) + '\n'
+                                 for record in records))
+
+def cli_error(mode, message):
+    """Report a failed CLI command; machine modes also exit non-zero"""
+    if not mode:
+        print(f"{G.RED}✖ {message}{G.END}")
+        return
+    if mode == 'json':
+        sys.stdout.write(json.dumps({"ok": False, "error": message, "timings": timing_report()}) + '\n')
+    else:
+        sys.stderr.write(f"ghosty: {message}\n")
+    sys.exit(1)
+
+
+# Tracing
+# GHOSTY_TRACE=1 (or --trace) records where a run's time goes as a tree of
+# storage, render, output, input and sleep spans, with the files opened
+# and bytes written in each, and saves it to traces/ in the data folder.
+# GHOSTY_TRACE=profile saves a cProfile .pstats file there instead. The
+# traced functions are only wrapped once tracing starts, so normal runs
+# pay nothing for it.
+
+TRACE_KEEP = 20  # Trace files kept in traces/
+TRACED_FUNCTIONS = {
+    "storage": ('load_config', 'save_config', 'load_todos', 'load_todo_page', 'load_db', 'save_todos',
+                'commit_todos', 'backup_data', 'search_index', 'log_search_ops', 'search_todos'),
+    "render": ('banner_lines', 'render_banner', 'todo_list_frame', 'show_todo_page', 'display_todo_list'),
+    "input": ('status_input',),
+}
+
+_trace = {"mode": None, "label": "", "root": None, "stack": [], "thread": None,
+          "began": None, "startup": None, "opens": 0, "hooked": False, "io": None, "profile": None}
+
+def trace_mode(args=None, argv=()):
+    """'spans', 'profile' or None, from GHOSTY_TRACE and --trace"""
+    env = os.environ.get("GHOSTY_TRACE", "").strip().lower()
+    if env == "profile":
+        return "profile"
+    if env not in ("", "0") or getattr(args, 'trace', False) or '--trace' in argv:
+        return "spans"
+    return None
+
+def _audit_open(event, args):
+    if event == "open" and _trace["mode"]:
+        _trace["opens"] += 1
+
+def _io_written():
+    """Bytes this process has handed to write calls (Linux only)"""
+    if _trace["io"] is None:
+        return 0
+    for line in os.pread(_trace["io"], 4096, 0).split(b'\n'):
+        if line.startswith(b'wchar:'):
+            return int(line.split()[1])
+    return 0
+
+def _span_node(kind):
+    return {"kind": kind, "calls": 0, "ms": 0.0, "opens": 0, "written": 0, "children": {}}
+
+def _span_enter(name, kind):
+    parent = _trace["stack"][-1]
+    node = parent["children"].get(name)
+    if node is None:
+        node = parent["children"][name] = _span_node(kind)
+    node["calls"] += 1
+    _trace["stack"].append(node)
+    return node, time.perf_counter(), _trace["opens"], _io_written()
+
+def _span_exit(node, began, opens, written):
+    node["ms"] += (time.perf_counter() - began) * 1000
+    node["opens"] += _trace["opens"] - opens
+    node["written"] += _io_written() - written
+    _trace["stack"].pop()
+
+def traced(func, name, kind):
+    """func wrapped in a span; calls from other threads are not traced"""
+    import functools
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _trace["mode"] or threading.get_ident() != _trace["thread"]:
+            return func(*args, **kwargs)
+        span = _span_enter(name, kind)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _span_exit(*span)
+    return wrapper
+
+class _TracedOutput:
+    """sys.stdout with its writes and flushes traced as output spans"""
+    def __init__(self, stream):
+        self._stream = stream
+        self.write = traced(stream.write, "stdout", "output")
+        self.flush = traced(stream.flush, "stdout.flush", "output")
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+def start_trace(mode, label):
+    """Start tracing the rest of this run (see finish_trace)"""
+    _trace["label"] = label
+    _trace["startup"] = dict(_timings["phases"])
+    _trace["thread"] = threading.get_ident()
+    if mode == "profile":
+        import cProfile
+        _trace["profile"] = cProfile.Profile()
+        _trace["mode"] = mode
+        _trace["profile"].enable()
+        return
+    try:
+        _trace["io"] = os.open("/proc/self/io", os.O_RDONLY)
+    except OSError:
+        pass
+    if hasattr(sys, 'addaudithook') and not _trace["hooked"]:
+        sys.addaudithook(_audit_open)  # Python 3.8+; opens stay at 0 before
+        _trace["hooked"] = True
+    module = globals()
+    for kind, names in TRACED_FUNCTIONS.items():
+        for name in names:
+            module[name] = traced(module[name], name, kind)
+    time.sleep = traced(time.sleep, "sleep", "sleep")
+    sys.stdout = _TracedOutput(sys.stdout)
+    _trace["root"] = _span_node("command")
+    _trace["stack"] = [_trace["root"]]
+    _trace["mode"] = mode
+    _trace["began"] = (time.perf_counter(), _io_written())
+
+def trace_lines(name, node, depth=0):
+    """A span and its children as indented report lines"""
+    line = f"{'  ' * depth}{name} [{node['kind']}]  {node['ms']:.2f} ms"
+    if node["calls"] > 1:
+        line += f"  x{node['calls']}"
+    if node["opens"]:
+        line += f"  opened={node['opens']}"
+    if node["written"]:
+        line += f"  written={node['written']}B"
+    lines = [line]
+    for child_name, child in node["children"].items():
+        lines.extend(trace_lines(child_name, child, depth + 1))
+    return lines
+
+def finish_trace():
+    """Stop tracing and save the trace, reporting its path on stderr"""
+    mode = _trace["mode"]
+    if not mode:
+        return
+    if mode == "profile":
+        _trace["profile"].disable()
+    else:
+        root = _trace["root"]
+        root["calls"] = 1
+        began, written = _trace["began"]
+        root["ms"] = (time.perf_counter() - began) * 1000
+        root["opens"] = _trace["opens"]
+        root["written"] = _io_written() - written
+    _trace["mode"] = None
+    try:
+        trace_dir = DATA_DIR / "traces"
+        trace_dir.mkdir(exist_ok=True, parents=True)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        if mode == "profile":
+            path = trace_dir / f"{stem}.pstats"
+            _trace["profile"].dump_stats(str(path))
+        else:
+            path = trace_dir / f"{stem}.txt"
+            startup = ', '.join(f"{name} {ms} ms" for name, ms in _trace["startup"].items())
+            header = f"# ghosty {_trace['label']} (before tracing: {startup})"
+            atomic_write(path, '\n'.join([header] + trace_lines("total", root)) + '\n')
+        for old in sorted(trace_dir.iterdir())[:-TRACE_KEEP]:
+            old.unlink()
+    except OSError as e:
+        sys.stderr.write(f"ghosty: could not save the trace: {e}\n")
+        return
+    sys.stderr.write(f"trace\t{path}\n")
+
+
+# CLI Interface
+
+def setup_cli(only=None):
+    """Setup argparse CLI interface with range support
+
+    With only set to a command name (see CLI_COMMANDS), just that
+    command's subparser is built, which is enough to parse its arguments.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='ghosty',
+        description='Ghosty Todo - A minimalist todo list manager',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  ghosty list                            Show todos
+  ghosty list --page 2 --limit 20        Show todos 21 to 40
+  ghosty add "Buy groceries"             Add a todo
+  ghosty check 1 3-5                     Check todos 1, 3, 4, 5
+  ghosty hold 2-4                        Hold todos 2, 3, 4
+  ghosty remove 1 3-5 7                  Remove todos 1, 3, 4, 5, 7
+  ghosty move -2- --to work              Move the last two todos to "work"
+  ghosty mark pending 1-20/2             Set every other todo to pending
+  ghosty search groc --all               Find todos in every focus by word prefix
+  ghosty import todos.csv                Import todos from CSV/JSON Lines/text
+  ghosty export --format csv > all.csv   Export every todo
+  ghosty restore 12                      Restore backup generation 12
+  ghosty --porcelain check 2-4           Script-friendly output (also --json, -q)
+  ghosty daemon &                        Serve later commands from memory
+  NO_COLOR=1 ghosty list                 No colours, even on a terminal
+
+Number Formats:
+  Single: 1
+  Multiple: 1 3 5
+  Ranges: 1-5 or 3-5 7 9-11
+  Open ranges: 5- (5 to the last todo)
+  Steps: 1-20/2 (every other todo from 1 to 20)
+  From the end: -1 (the last todo), -3- (the last three), -5--2 (fifth to second last)
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    
+    def wanted(name):
+        return only is None or only == name
+    
+    # List command
+    if wanted('list'):
+        list_parser = subparsers.add_parser('list', aliases=['ls'], help='List all todos')
+        list_parser.add_argument('--page', type=int, help='Show only this page of the list')
+        list_parser.add_argument('--limit', type=int, help='Todos per page (default: terminal height)')
+    
+    # Add command
+    if wanted('add'):
+        add_parser = subparsers.add_parser('add', aliases=['a'], help='Add a new todo')
+        add_parser.add_argument('text', nargs='+', help='Todo text (supports multiple todos)')
+    
+    # Check/uncheck command - accept strings for ranges
+    if wanted('check'):
+        check_parser = subparsers.add_parser('check', aliases=['c'], help='Check/uncheck a todo')
+        check_parser.add_argument('numbers', nargs='+', help='Todo number(s) or ranges (e.g., 1 3-5 7)')
+    
+    # Hold command - accept strings for ranges
+    if wanted('hold'):
+        hold_parser = subparsers.add_parser('hold', aliases=['h'], help='Toggle hold status')
+        hold_parser.add_argument('numbers', nargs='+', help='Todo number(s) or ranges (e.g., 1 3-5 7)')
+    
+    # Remove command - accept strings for ranges
+    if wanted('remove'):
+        remove_parser = subparsers.add_parser('remove', aliases=['r', 'rm'], help='Remove a todo')
+        remove_parser.add_argument('numbers', nargs='+', help='Todo number(s) or ranges (e.g., 1 3-5 7)')
+    
+    # Move command
+    if wanted('move'):
+        move_parser = subparsers.add_parser('move', aliases=['mv'], help='Move todos to another focus')
+        move_parser.add_argument('numbers', nargs='+', help='Todo number(s) or ranges (e.g., 1 3-5 7)')
+        move_parser.add_argument('--to', required=True, metavar='FOCUS', help='Focus to move them to')
+    
+    # Mark command
+    if wanted('mark'):
+        mark_parser = subparsers.add_parser('mark', help='Set the status of todos')
+        mark_parser.add_argument('status', choices=TODO_STATUSES, help='Status to set')
+        mark_parser.add_argument('numbers', nargs='+', help='Todo number(s) or ranges (e.g., 1 3-5 7)')
+    
+    # Search command
+    if wanted('search'):
+        search_parser = subparsers.add_parser('search', aliases=['s'], help='Find todos by words or word prefixes')
+        search_parser.add_argument('query', nargs='+', help='Words to look for (a typo is forgiven)')
+        search_scope = search_parser.add_mutually_exclusive_group()
+        search_scope.add_argument('--focus', help='Focus to search (default: current focus)')
+        search_scope.add_argument('--all', action='store_true', help='Search every focus')
+        search_parser.add_argument('--status', choices=TODO_STATUSES, help='Only todos with this status')
+    
+    # Import / export commands
+    if wanted('import'):
+        import_parser = subparsers.add_parser('import', help='Import todos from a file or stdin')
+        import_parser.add_argument('file', nargs='?', default='-', help='File to read (default: stdin)')
+        import_parser.add_argument('--format', choices=TRANSFER_FORMATS, help='Input format (default: from extension, else jsonl)')
+        import_parser.add_argument('--focus', help='Focus for records without one (default: current focus)')
+    if wanted('export'):
+        export_parser = subparsers.add_parser('export', help='Export todos to a file or stdout')
+        export_parser.add_argument('file', nargs='?', default='-', help='File to write (default: stdout)')
+        export_parser.add_argument('--format', choices=TRANSFER_FORMATS, help='Output format (default: from extension, else jsonl)')
+        export_parser.add_argument('--focus', help='Only export this focus (default: every focus)')
+    if wanted('convert'):
+        convert_parser = subparsers.add_parser('convert', help='Convert a todos.json file to the packed format or back')
+        convert_parser.add_argument('source', help='todos.json-style list or .pack file to read')
+        convert_parser.add_argument('dest', help='File to write - packed when it ends in .pack, else JSON')
+    
+    # Backup commands
+    if wanted('backups'):
+        subparsers.add_parser('backups', help='List backup generations')
+    if wanted('sqlite-import'):
+        sqlite_parser = subparsers.add_parser('sqlite-import', help='Move todos into the sqlite storage engine')
+        sqlite_parser.add_argument('--backup', metavar='SOURCE',
+                                   help='Import a backup generation number or old backups/todos_*.json file instead')
+    if wanted('restore'):
+        restore_parser = subparsers.add_parser('restore', help='Restore a backup generation')
+        restore_parser.add_argument('generation', type=int, help='Generation number (see ghosty backups)')
+    
+    # Daemon command
+    if wanted('daemon'):
+        daemon_parser = subparsers.add_parser('daemon', help='Serve CLI commands from memory over a local socket')
+        daemon_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    
+    # Help command
+    if wanted('help'):
+        help_parser = subparsers.add_parser('help', aliases=['?'], help='Show help information')
+    
+    # Machine output flags work before or after the command
+    add_output_flags(parser, False)
+    for command_parser in {id(p): p for p in subparsers.choices.values()}.values():
+        add_output_flags(command_parser, argparse.SUPPRESS)
+    
+    return parser
+
+def add_output_flags(parser, default):
+    """Add the machine output options (see Machine Output) to a parser"""
+    group = parser.add_argument_group('script output')
+    group.add_argument('--json', action='store_true', default=default,
+                       help='Print one JSON object with the result records and timings')
+    group.add_argument('--porcelain', action='store_true', default=default,
+                       help='Print stable tab-separated records, one per line')
+    group.add_argument('-q', '--quiet', action='store_true', default=default,
+                       help='Print nothing but errors; the exit status tells the result')
+    group.add_argument('--timings', action='store_true', default=default,
+                       help='Print phase timings in milliseconds to stderr')
+    group.add_argument('--startup-profile', action='store_true', default=default,
+                       help='Print interpreter, import and init times plus deferred imports to stderr')
+    group.add_argument('--trace', action='store_true', default=default,
+                       help='Save a tree of timed spans to traces/ in the data folder (see GHOSTY_TRACE)')
+
+# Every command name and alias, mapped to the name setup_cli() knows it by
+CLI_COMMANDS = {
+    'list': 'list', 'ls': 'list', 'add': 'add', 'a': 'add',
+    'check': 'check', 'c': 'check', 'hold': 'hold', 'h': 'hold',
+    'remove': 'remove', 'r': 'remove', 'rm': 'remove', 'move': 'move', 'mv': 'move',
+    'mark': 'mark', 'search': 'search', 's': 'search',
+    'import': 'import', 'export': 'export', 'convert': 'convert', 'backups': 'backups',
+    'sqlite-import': 'sqlite-import', 'restore': 'restore',
+    'daemon': 'daemon', 'help': 'help', '?': 'help',
+}
+
+def cli_command(argv):
+    """The command named in argv (first non-option argument), or None"""
+    return next((arg for arg in argv if not arg.startswith('-')), None)
+
+# Options from add_output_flags by argparse dest, and the everyday commands
+# whose arguments are words, which parse_simple_args() handles itself -
+# argparse would take from-the-end numbers like -3- for options. move
+# also takes --to FOCUS and mark a status word ahead of the numbers.
+OUTPUT_FLAGS = {'--json': 'json', '--porcelain': 'porcelain', '-q': 'quiet', '--quiet': 'quiet',
+                '--timings': 'timings', '--startup-profile': 'startup_profile', '--trace': 'trace'}
+SIMPLE_COMMANDS = {'list': None, 'add': 'text', 'check': 'numbers', 'hold': 'numbers', 'remove': 'numbers',
+                   'move': 'numbers', 'mark': 'numbers', 'search': 'query'}
+
+def parse_simple_args(argv):
+    """Parse an everyday command without importing argparse
+
+    Returns the namespace argparse would have built, or None when argv
+    needs the real parser (help, errors, unknown options, other commands).
+    """
+    from types import SimpleNamespace
+    command = cli_command(argv)
+    name = CLI_COMMANDS.get(command)
+    if name not in SIMPLE_COMMANDS:
+        return None
+    args = SimpleNamespace(command=command, **{dest: False for dest in OUTPUT_FLAGS.values()})
+    words = []
+    rest = iter(argv[argv.index(command) + 1:])
+    for arg in rest:
+        if arg in OUTPUT_FLAGS:
+            setattr(args, OUTPUT_FLAGS[arg], True)
+        elif name == 'move' and arg == '--to':
+            args.to = next(rest, None)
+        elif name == 'move' and arg.startswith('--to='):
+            args.to = arg[len('--to='):]
+        elif SIMPLE_COMMANDS[name] == 'numbers' and re.match(NUMBER_SELECTOR, arg):
+            words.append(arg)  # From-the-end numbers like -1 or -3- aren't options
+        elif arg.startswith('-'):
+            return None
+        else:
+            words.append(arg)
+    for arg in argv[:argv.index(command)]:
+        if arg not in OUTPUT_FLAGS:
+            return None
+        setattr(args, OUTPUT_FLAGS[arg], True)
+    if SIMPLE_COMMANDS[name] is None:
+        return None if words else args
+    if name == 'move' and not getattr(args, 'to', None):
+        return None
+    if name == 'mark':
+        if not words or words[0] not in TODO_STATUSES:
+            return None
+        args.status = words.pop(0)
+    if not words:
+        return None
+    setattr(args, SIMPLE_COMMANDS[name], words)
+    return args
+
+def handle_cli(args):
+    """Handle CLI commands with range support"""
+    mode = machine_mode(args)
+    config = load_config()
+    current_focus = config.get("current_focus", "default")
+    
+    if args.command in ['list', 'ls']:
+        page = getattr(args, 'page', None)
+        limit = getattr(args, 'limit', None)
+        if (page is not None and page < 1) or (limit is not None and limit < 1):
+            cli_error(mode, "--page and --limit must be positive")
+            return
+        if not mode:
+            display_todo_list(show_banner=False, page=page, limit=limit)
+            return
+        if page is None and limit is None:
+            todos, start = load_todos(current_focus), 0
+        else:
+            todos, _, _, _, start = load_todo_page(current_focus, page or 1, limit or list_page_size())
+        mark_timing("load")
+        emit_result(mode, [todo_record('todo', n, t) for n, t in enumerate(todos, start + 1)])
+        return
+    
+    if args.command in ['search', 's']:
+        if getattr(args, 'all', False):
+            focus = None
+        else:
+            focus = getattr(args, 'focus', None) or current_focus
+        results = search_todos(' '.join(args.query), focus, getattr(args, 'status', None))
+        mark_timing("search")
+        if mode:
+            emit_result(mode, [todo_record('todo', n, t) for n, t in results])
+        elif results:
+            now = int(time.time())
+            sys.stdout.write(''.join(todo_row(n, t, focus is None, now) + '\n' for n, t in results))
+        else:
+            print(f"{G.LIGHT_GREY}No todos match \"{' '.join(args.query)}\"{G.END}")
+        return
+    
+    # Only add and the batch commands below load the todos
+    if args.command in ['help', '?']:
+        # Show CLI help
+        parser = setup_cli()
+        parser.print_help()
+        return
+    
+    elif args.command == 'import':
+        fmt = args.format or guess_format(args.file)
+        try:
+            if args.file == '-':
+                count, errors, duplicates = import_todos(sys.stdin, fmt, args.focus or current_focus)
+            else:
+                with open(args.file, 'r', encoding='utf-8', newline='') as f:
+                    count, errors, duplicates = import_todos(f, fmt, args.focus or current_focus)
+        except (OSError, ValueError) as e:
+            cli_error(mode, f"Import failed: {e}")
+            return
+        if mode:
+            records = [{"type": "imported", "count": count}]
+            records += [{"type": "skipped", "line": number, "error": error} for number, error in errors]
+            records += [{"type": "duplicate", "line": number, "id": todo_id} for number, todo_id in duplicates]
+            emit_result(mode, records)
+            return
+        for number, error in errors[:10]:
+            print(f"{G.YELLOW}✖ Skipped line {number}: {error}{G.END}")
+        if len(errors) > 10:
+            print(f"{G.YELLOW}✖ ...and {len(errors) - 10} more{G.END}")
+        if duplicates:
+            ids = ', '.join(todo_id for _, todo_id in duplicates[:10])
+            more = f" and {len(duplicates) - 10} more" if len(duplicates) > 10 else ''
+            print(f"{G.LIGHT_GREY}Skipped {len(duplicates)} duplicate(s), already stored: {ids}{more}{G.END}")
+        print(f"{G.HAUNTED_GREEN}✔ Imported {count} todo(s){G.END}")
+        return
+    
+    elif args.command == 'export':
+        fmt = args.format or guess_format(args.file)
+        try:
+            if args.file == '-':
+                export_todos(sys.stdout, fmt, args.focus)
+            else:
+                with open(args.file, 'w', encoding='utf-8', newline='') as f:
+                    count = export_todos(f, fmt, args.focus)
+                if mode:
+                    emit_result(mode, [{"type": "exported", "count": count, "file": args.file}])
+                else:
+                    print(f"{G.HAUNTED_GREEN}✔ Exported {count} todo(s) to {args.file}{G.END}")
+        except OSError as e:
+            cli_error(mode, f"Export failed: {e}")
+        return
+    
+    elif args.command == 'backups':
+        backups = list_backups()
+        if mode:
+            emit_result(mode, [{"type": "backup", "id": manifest["id"], "created": manifest["created"],
+                                "files": ','.join(sorted(manifest["files"]))} for manifest in backups])
+            return
+        if not backups:
+            print(f"{G.LIGHT_GREY}(no backups yet){G.END}")
+        for manifest in backups:
+            created = manifest["created"][:19].replace('T', ' ')
+            names = ', '.join(sorted(manifest["files"]))
+            print(f"   {G.CYAN_FAINT}{manifest['id']}.{G.END} {G.WHITE}{created}{G.END} {G.DARK_GREY}{names}{G.END}")
+        return
+    
+    elif args.command == 'convert':
+        try:
+            todos = read_todo_file(args.source)
+            write_todo_file(args.dest, todos)
+        except Exception as e:
+            cli_error(mode, f"Convert failed: {e}")
+            return
+        if mode:
+            emit_result(mode, [{"type": "converted", "count": len(todos)}])
+        else:
+            print(f"{G.HAUNTED_GREEN}✔ Converted {len(todos)} todo(s) into {args.dest}{G.END}")
+        return
+    
+    elif args.command == 'sqlite-import':
+        try:
+            count = import_to_sqlite(args.backup)
+        except Exception as e:
+            cli_error(mode, f"Import failed: {e}")
+            return
+        if mode:
+            emit_result(mode, [{"type": "imported", "count": count}])
+        else:
+            print(f"{G.HAUNTED_GREEN}✔ Imported {count} todo(s) into {TODO_DB.name} - storage engine is now sqlite{G.END}")
+        return
+    
+    elif args.command == 'restore':
+        try:
+            manifest = restore_backup(args.generation)
+        except Exception as e:
+            cli_error(mode, f"Restore failed: {e}")
+            return
+        if mode:
+            emit_result(mode, [{"type": "restored", "id": manifest["id"], "created": manifest["created"]}])
+        else:
+            print(f"{G.HAUNTED_GREEN}✔ Restored backup {manifest['id']} from {manifest['created'][:19].replace('T', ' ')}{G.END}")
+        return
+    
+    elif args.command in ['add', 'a']:
+        # Join text arguments that might be split
+        if hasattr(args, 'text'):
+            text = ' '.join(args.text)
+        else:
+            text = ''
+            
+        if text:
+            index = TodoIndex(load_todos(current_focus))
+            mark_timing("load")
+            todo = new_todo(text, current_focus)
+            index.add(todo)
+            commit_todos(index.todos(), [make_op('add', todo)], focus=current_focus)
+            if mode:
+                emit_result(mode, [todo_record('added', len(index.by_focus[current_focus]), todo)])
+                return
+            print(f"{G.HAUNTED_GREEN}✔ Added:{G.END} \"{text}\"")
+        else:
+            cli_error(mode, "No todo text provided")
+            return
+    
+    elif CLI_COMMANDS.get(args.command) in BATCH_ACTIONS:
+        action = CLI_COMMANDS[args.command]
+        if not hasattr(args, 'numbers') or not args.numbers:
+            cli_error(mode, "No numbers provided")
+            return
+        
+        # Parse numbers including ranges
+        numbers_input = ' '.join(map(str, args.numbers))
+        numbers = parse_numbers(numbers_input)
+        
+        if not numbers:
+            cli_error(mode, "No valid numbers provided")
+            return
+        
+        value = None
+        if action == 'move':
+            value = args.to
+            if value not in config.get("focuses", []):
+                cli_error(mode, f"No focus named \"{value}\"")
+                return
+        elif action == 'mark':
+            value = args.status
+        
+        index = TodoIndex(load_todos(current_focus))
+        todos = index.focus(current_focus)
+        mark_timing("load")
+        summary = batch_mutate(index, todos, numbers, action, current_focus, value)
+        changes, invalid = summary["changes"], summary["invalid"]
+        
+        if mode:
+            records = [todo_record(label, num, t) for label, num, t in changes]
+            records += [{"type": "invalid", "n": int(num) if num.lstrip('-').isdigit() else num}
+                        for num in invalid]
+            emit_result(mode, records)
+            if invalid:
+                sys.exit(1)
+            return
+        
+        labels = {
+            'checked': f"{G.HAUNTED_GREEN}✓ Checked:",
+            'unchecked': f"{G.YELLOW}✖ Unchecked:",
+            'held': f"{G.YELLOW}✓ On hold:",
+            'unheld': f"{G.YELLOW}✓ Unhold:",
+            'removed': f"{G.RED}✖ Removed:",
+            'moved': f"{G.CYAN_FAINT}→ Moved to @{value}:",
+            'marked': f"{G.HAUNTED_GREEN}✓ Marked {value}:",
+        }
+        if config.get("show_responses", True):
+            for label, num, t in changes:
+                print(f"{labels[label]}{G.END} {t['text']}")
+        for num in invalid:
+            print(f"{G.RED}Invalid todo number: {num}{G.END}")
+        
+        if summary["counts"]:
+            print(f"{G.HAUNTED_GREEN}✔ {', '.join(f'{count} {name}' for name, count in summary['counts'])}{G.END}")
+    
+    # Reprint list if enabled
+    if config.get("reprint_list", True):
+        print()
+        display_todo_list(show_banner=False)
+
+
+def run_cli(args):
+    """Run one CLI command, then print --timings / --startup-profile if asked"""
+    if args.command == 'daemon':
+        run_daemon(args)
+        return
+    handle_cli(args)
+    if "command" not in _timings["phases"]:
+        mark_timing("command")
+    if getattr(args, 'timings', False):
+        sys.stderr.write(''.join(f"timing\t{name}\t{ms}\n" for name, ms in timing_report().items()))
+    if getattr(args, 'startup_profile', False):
+        print_startup_profile()
+
+# Imported on demand; --startup-profile reports which ones a command needed
+DEFERRED_MODULES = ['argparse', 'csv', 'datetime', 'hashlib', 'zlib', 'sqlite3', 'mmap', 'struct', 'socket',
+                    'orjson']
+
+def print_startup_profile():
+    """Report where a run's time went, from interpreter start on, to stderr"""
+    lines = [("interpreter", round(START_CPU * 1000, 3))] + list(timing_report().items())
+    deferred = [name for name in DEFERRED_MODULES
+                if name in sys.modules and name not in IMPORTED_AT_START]
+    lines.append(("deferred", ','.join(deferred) or '-'))
+    sys.stderr.write(''.join(f"startup\t{name}\t{value}\n" for name, value in lines))
+
+
+# Daemon
+#
+# 'ghosty daemon' keeps the parsed store resident and serves CLI commands
+# over a Unix socket in the data folder. main() forwards the commands in
+# DAEMON_COMMANDS to it when one is listening and runs them itself
+# otherwise, so the daemon is purely an accelerator.
+
+DAEMON_COMMANDS = {'list', 'ls', 'add', 'a', 'check', 'c', 'hold', 'h', 'remove', 'r', 'rm', 'move', 'mv', 'mark', 'search', 's'}
+
+def daemon_socket():
+    return DATA_DIR / "ghosty.sock"
+
+def _daemon_call(message):
+    """Send one request to the daemon, return its reply or None"""
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(daemon_socket()))
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return json.loads(b''.join(chunks).decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+def daemon_request(argv):
+    """Run argv in a running daemon, return its exit code
+
+    Returns None - run the command locally - when argv isn't a
+    DAEMON_COMMANDS command, is being traced or no daemon answers.
+    """
+    command = cli_command(argv)
+    if command not in DAEMON_COMMANDS or os.name == 'nt' or not daemon_socket().exists():
+        return None
+    if trace_mode(argv=argv):
+        return None  # Traced runs happen in this process
+    reply = _daemon_call(dict(terminal_state(), argv=argv))
+    if reply is None:
+        return None
+    if '--json' in argv or '--porcelain' in argv:
+        raw_output()
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["code"]
+
+def _serve_request(parser, request):
+    """Run one forwarded command, capturing its output and exit code"""
+    import io
+    from contextlib import redirect_stdout, redirect_stderr
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    reset_timings()
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            args = parse_simple_args(request["argv"]) or parser.parse_args(request["argv"])
+            if args.command not in DAEMON_COMMANDS:
+                raise SystemExit(2)  # Clients only forward these
+            # Coloured or plain as the client's terminal wants, not the daemon's
+            use_plain_output(wants_plain_output(machine_mode(args), request))
+            load_config()
+            try:
+                run_cli(args)
+            except StorageError as e:
+                cli_error(machine_mode(args), str(e))
+                code = 1
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"{G.RED}✖ {e}{G.END}")
+            code = 1
+    return {"stdout": out.getvalue(), "stderr": err.getvalue(), "code": code}
+
+def run_daemon(args):
+    """Serve forwarded CLI commands until stopped (ghosty daemon --stop)"""
+    if os.name == 'nt':
+        print(f"{G.RED}✖ The daemon needs Unix sockets, which this platform lacks{G.END}")
+        return
+    if args.stop:
+        if _daemon_call({"stop": True}) is None:
+            print(f"{G.LIGHT_GREY}(no daemon running){G.END}")
+        else:
+            print(f"{G.HAUNTED_GREEN}✔ Daemon stopped{G.END}")
+        return
+    if _daemon_call({"ping": True}) is not None:
+        print(f"{G.RED}✖ A daemon is already running on {daemon_socket()}{G.END}")
+        return
+    
+    import socket
+    path = daemon_socket()
+    if path.exists():
+        path.unlink()  # Left behind by a daemon that was killed
+    ensure_data_dir()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)  # Only this user may talk to the daemon
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    keep_todos_resident()
+    parser = setup_cli()
+    print(f"{G.HAUNTED_GREEN}✔ Ghosty daemon listening on {path}{G.END}")
+    sys.stdout.flush()
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                data = b''
+                while not data.endswith(b'\n'):
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+                try:
+                    request = json.loads(data.decode('utf-8'))
+                except ValueError:
+                    continue
+                if request.get("stop"):
+                    conn.sendall(b'{}')
+                    break
+                reply = {} if request.get("ping") else _serve_request(parser, request)
+                try:
+                    conn.sendall(json.dumps(reply).encode('utf-8'))
+                except OSError:
+                    pass  # Client went away
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if path.exists():
+            path.unlink()
+
+
+# Main Entry Point
+
+def main():
+    """Main entry point"""
+    use_output_writer()
+    if len(sys.argv) > 1:
+        # A running daemon serves plain CLI commands from memory
+        code = daemon_request(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+    
+    mark_timing("module")
+    
+    # Everyday commands skip argparse; others build only their subparser
+    args = parse_simple_args(sys.argv[1:])
+    if args is None:
+        parser = setup_cli(CLI_COMMANDS.get(cli_command(sys.argv[1:])))
+        args = parser.parse_args()
+    mode = machine_mode(args)
+    if wants_plain_output(mode, terminal_state()):
+        use_plain_output()
+    if mode or args.command == 'export':
+        raw_output()
+    mark_timing("args")
+    
+    # Ensure data directory exists (this will set DATA_DIR correctly)
+    global DATA_DIR, TODO_FILE, JOURNAL_FILE, SHARD_DIR, TODO_DB, PACK_FILE, CONFIG_FILE
+    DATA_DIR = ensure_data_dir()
+    TODO_FILE = DATA_DIR / "todos.json"
+    JOURNAL_FILE = DATA_DIR / "todos.journal"
+    SHARD_DIR = DATA_DIR / "todos.d"
+    TODO_DB = DATA_DIR / "todos.db"
+    PACK_FILE = DATA_DIR / "todos.pack"
+    CONFIG_FILE = DATA_DIR / "config.json"
+    
+    tracing = trace_mode(args)
+    if tracing:
+        start_trace(tracing, ' '.join(sys.argv[1:]) or '(menu)')
+    
+    # Load config to set theme
+    if not mode:
+        load_config()
+    
+    try:
+        # If no command provided, launch interactive UI
+        if not args.command:
+            if getattr(args, 'startup_profile', False):
+                mark_timing("config")
+                print_startup_profile()
+            set_terminal_title("Ghosty Todo - By AK")
+            if os.name == 'nt':
+                os.system('')  # Once: switches the console to ANSI escape handling
+            try:
+                main_menu()
+            except KeyboardInterrupt:
+                print()
+                goodbye_and_exit()
+        else:
+            # Handle CLI command
+            run_cli(args)
+    except StorageError as e:
+        end_frame()
+        cli_error(mode, str(e))
+        sys.exit(1)
+    finally:
+        # Finish a journal compaction while the module is still intact
+        wait_for_compaction()
+        finish_trace()
+
+if __name__ == "__main__":
+    main()
+
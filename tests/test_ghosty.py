@@ -0,0 +1,291 @@
+"""Tests for Ghosty's parsing, storage engines and script-mode exit codes
+
+Storage tests run in a data folder of their own under tmp_path, and
+command line tests in a portable copy of ghosty.py, so your own todos are
+never touched.
+
+    python -m pytest tests
+"""
+
+import copy
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import ghosty
+
+
+# Todo numbers
+
+def numbers(text, count):
+    """Selected numbers lowest first, and the invalid labels"""
+    selection = ghosty.parse_numbers(text)
+    return sorted(selection.descending(count)), selection.invalid(count)
+
+
+@pytest.mark.parametrize("text, selected", [
+    ("3", [3]),
+    ("1 3,5", [1, 3, 5]),
+    ("3-5 7", [3, 4, 5, 7]),
+    ("8-", [8, 9, 10]),
+    ("-1", [10]),
+    ("-3-", [8, 9, 10]),
+    ("-5--2", [6, 7, 8, 9]),
+    ("1-10/3", [1, 4, 7, 10]),
+    ("2-/4", [2, 6, 10]),
+    ("1-5 3-7", [1, 2, 3, 4, 5, 6, 7]),
+])
+def test_parse_numbers_selects(text, selected):
+    assert numbers(text, 10) == (selected, [])
+
+
+@pytest.mark.parametrize("text, selected, invalid", [
+    ("11-100", [], ["11-100"]),
+    ("1-20/2", [1, 3, 5, 7, 9], ["11-20"]),
+    ("-12--9", [1, 2], ["-12--11"]),
+    ("0", [], ["0"]),
+])
+def test_parse_numbers_reports_numbers_past_the_list(text, selected, invalid):
+    assert numbers(text, 10) == (selected, invalid)
+
+
+def test_parse_numbers_skips_what_is_not_a_number():
+    assert not ghosty.parse_numbers("abc 1-2-3 4/0")
+    assert numbers("x 2", 10) == ([2], [])
+
+
+def test_parse_numbers_clamps_before_expanding():
+    ranges, invalid = ghosty.parse_numbers("1-100000000").resolve(3)
+    assert ranges == [range(1, 4)]
+    assert invalid == ["4-100000000"]
+
+
+# Packed storage
+
+PACK_TODOS = [
+    {"id": "a1", "text": "Buy groceries", "status": "pending", "focus": "default",
+     "created": "2024-01-02T03:04:05", "created_ts": 1704164645},
+    {"id": "b2", "text": "Ünïcödé ☃ 👻 日本語", "status": "done", "focus": "work",
+     "created": "2024-01-02T03:04:06", "created_ts": 1704164646},
+    {"id": "c3", "text": "", "status": "on-hold", "focus": "Fokus ✓",
+     "created": "2024-01-02T03:04:07", "created_ts": -5},
+    {"id": "d4", "text": "from an old version", "status": "pending", "focus": "default",
+     "created": "2024-01-02T03:04:08"},
+    {"id": "e5", "text": "odd values", "status": None, "focus": "work",
+     "created_ts": 1.5, "tags": ["x", "ÿ"], "priority": 2},
+]
+
+
+def test_pack_round_trip():
+    data = ghosty.encode_pack(PACK_TODOS)
+    assert data.startswith(ghosty.PACK_MAGIC)
+    assert [dict(todo) for todo in ghosty.decode_pack(data)] == PACK_TODOS
+
+
+def test_pack_decodes_one_focus():
+    data = ghosty.encode_pack(PACK_TODOS)
+    assert [todo["id"] for todo in ghosty.decode_pack(data, "work")] == ["b2", "e5"]
+    assert ghosty.decode_pack(data, "nowhere") == []
+
+
+def test_empty_pack():
+    assert ghosty.decode_pack(ghosty.encode_pack([])) == []
+
+
+# Journal replay
+
+def journal_todo(todo_id, focus="default", status="pending"):
+    return {"id": todo_id, "text": f"todo {todo_id}", "status": status, "focus": focus,
+            "created": "2024-01-02T03:04:05", "created_ts": 1704164645}
+
+
+SNAPSHOT = [journal_todo("a"), journal_todo("b"), journal_todo("c", "work"), journal_todo("d", "home")]
+OPS = [
+    ghosty.make_op("add", journal_todo("e")),
+    ghosty.make_op("set", journal_todo("a", status="done")),
+    ghosty.make_op("del", journal_todo("b")),
+    {"op": "drop", "focus": "work"},
+    ghosty.make_op("add", journal_todo("f", "work")),
+    ghosty.make_op("set", journal_todo("e", status="on-hold")),
+]
+REPLAYED = [journal_todo("a", status="done"), journal_todo("d", "home"),
+            journal_todo("e", status="on-hold"), journal_todo("f", "work")]
+
+
+def replay(todos, ops):
+    return ghosty.apply_ops(copy.deepcopy(todos), copy.deepcopy(ops))
+
+
+def test_apply_ops():
+    assert replay(SNAPSHOT, OPS) == REPLAYED
+
+
+@pytest.mark.parametrize("folded", range(len(OPS) + 1))
+def test_apply_ops_replays_folded_records_harmlessly(folded):
+    # A compaction interrupted after folding the first records into the
+    # snapshot leaves the whole journal behind to be replayed again
+    snapshot = replay(SNAPSHOT, OPS[:folded])
+    assert replay(snapshot, OPS) == REPLAYED
+
+
+def test_apply_ops_matches_todo_ids_and_legacy_keys():
+    legacy = {"text": "from before ids", "status": "pending", "created": "2023-01-01T00:00:00"}
+    ops = [{"op": "set", "text": legacy["text"], "created": legacy["created"], "status": "done"},
+           ghosty.make_op("del", journal_todo("a"))]
+    assert replay([legacy, journal_todo("a")], ops) == [dict(legacy, status="done")]
+
+
+def test_todo_index_applies_records_like_apply_ops():
+    index = ghosty.TodoIndex(ghosty.as_todos(copy.deepcopy(SNAPSHOT)))
+    index.apply(copy.deepcopy(OPS))
+    index.apply(copy.deepcopy(OPS))
+    assert [dict(todo) for todo in index.todos()] == REPLAYED
+
+
+# Config merging
+
+CONFIG_BASE = {"theme": "ghost", "current_focus": "default", "focuses": ["default", "work", "home"]}
+
+
+def test_merge_config_keeps_changes_from_both_sides():
+    ours = dict(CONFIG_BASE, theme="pumpkin")
+    theirs = dict(CONFIG_BASE, current_focus="work", storage="journal")
+    assert ghosty.merge_config(CONFIG_BASE, ours, theirs) == {
+        "theme": "pumpkin", "current_focus": "work", "focuses": ["default", "work", "home"], "storage": "journal"}
+
+
+def test_merge_config_prefers_ours_when_both_change_a_setting():
+    ours = dict(CONFIG_BASE, theme="pumpkin")
+    theirs = dict(CONFIG_BASE, theme="midnight")
+    assert ghosty.merge_config(CONFIG_BASE, ours, theirs)["theme"] == "pumpkin"
+
+
+def test_merge_config_merges_focus_lists_item_wise():
+    ours = dict(CONFIG_BASE, focuses=["default", "home", "errands"])   # -work +errands
+    theirs = dict(CONFIG_BASE, focuses=["default", "work", "home", "gym"])  # +gym
+    merged = ghosty.merge_config(CONFIG_BASE, ours, theirs)
+    assert merged["focuses"] == ["default", "home", "gym", "errands"]
+
+
+def test_merge_config_without_local_changes_is_theirs():
+    theirs = dict(CONFIG_BASE, focuses=["default"], theme="midnight")
+    assert ghosty.merge_config(CONFIG_BASE, dict(CONFIG_BASE), theirs) == theirs
+
+
+# Storage engines
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_FILES = {"TODO_FILE": "todos.json", "JOURNAL_FILE": "todos.journal", "SHARD_DIR": "todos.d",
+              "TODO_DB": "todos.db", "PACK_FILE": "todos.pack", "CONFIG_FILE": "config.json"}
+
+
+def forget_cached_store():
+    """Drop what the process keeps in memory, so the next load reads the files"""
+    ghosty.close_db()
+    ghosty._parsed.update(key=None, todos=None)
+    ghosty._config_cache.update(stat=None, config=None)
+    ghosty._search.update(signature=None, index=None)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty data folder in tmp_path"""
+    monkeypatch.setattr(ghosty, "get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(ghosty, "DATA_DIR", tmp_path)
+    for name, filename in DATA_FILES.items():
+        monkeypatch.setattr(ghosty, name, tmp_path / filename)
+    forget_cached_store()
+    yield tmp_path
+    ghosty.wait_for_compaction()
+    forget_cached_store()
+
+
+def stored(focus=None):
+    """Stored todos by id - the sharded engine keeps them grouped by focus"""
+    return sorted((dict(todo) for todo in ghosty.load_todos(focus)), key=lambda todo: todo["id"])
+
+
+STORED_TODOS = [journal_todo("a"), journal_todo("b", "work", "done"), journal_todo("c", "Fokus ✓", "on-hold"),
+                dict(journal_todo("d"), text="Ünïcödé ☃ 👻 日本語")]
+
+
+@pytest.mark.parametrize("engine", ghosty.STORAGE_ENGINES)
+def test_engine_round_trip(store, engine):
+    ghosty.switch_storage(ghosty.load_config(), engine)
+    ghosty.save_todos(copy.deepcopy(STORED_TODOS))
+    forget_cached_store()
+    assert ghosty.storage_engine() == engine
+    assert stored() == STORED_TODOS
+    assert stored("work") == [STORED_TODOS[1]]
+
+
+@pytest.mark.parametrize("engine", ghosty.STORAGE_ENGINES)
+def test_engine_commits_records(store, engine):
+    ghosty.switch_storage(ghosty.load_config(), engine)
+    ghosty.save_todos(copy.deepcopy(SNAPSHOT))
+    for op in OPS:
+        ghosty.commit_todos(None, [copy.deepcopy(op)])
+    forget_cached_store()
+    assert stored() == REPLAYED
+
+
+@pytest.mark.parametrize("engine", [e for e in ghosty.STORAGE_ENGINES if e != "json"])
+def test_switch_storage_moves_the_todos(store, engine):
+    ghosty.save_todos(copy.deepcopy(STORED_TODOS))
+    ghosty.switch_storage(ghosty.load_config(), engine)
+    forget_cached_store()
+    assert ghosty.storage_engine() == engine
+    assert stored() == STORED_TODOS
+
+
+# Script mode
+
+@pytest.fixture
+def cli(tmp_path):
+    """Run a portable copy of ghosty.py in tmp_path: (exit code, stdout, stderr)"""
+    for name in ("ghosty.py", "ghosty_app.py"):
+        shutil.copy(str(ROOT / name), str(tmp_path / name))
+    (tmp_path / "portable.txt").touch()
+
+    def run(*argv):
+        done = subprocess.run([sys.executable, "ghosty.py"] + list(argv), cwd=str(tmp_path),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        return done.returncode, done.stdout, done.stderr
+    run.data_dir = tmp_path / ".ghosty_data"
+    return run
+
+
+def test_json_mode_succeeds(cli):
+    code, out, _ = cli("--json", "add", "Buy milk")
+    assert code == 0 and json.loads(out)["ok"]
+    code, out, _ = cli("--json", "list")
+    assert code == 0
+    assert [record["text"] for record in json.loads(out)["records"]] == ["Buy milk"]
+
+
+@pytest.mark.parametrize("flag", ["--json", "--porcelain", "-q"])
+def test_machine_modes_exit_1_on_invalid_numbers(cli, flag):
+    cli("-q", "add", "Buy milk")
+    code, _, _ = cli(flag, "check", "5")
+    assert code == 1
+    assert cli(flag, "check", "1")[0] == 0
+
+
+@pytest.mark.parametrize("flag", ["--json", "--porcelain", "-q"])
+def test_machine_modes_exit_1_when_the_todos_cannot_be_written(cli, flag):
+    cli.data_dir.mkdir()
+    (cli.data_dir / "config.json").write_text('{"storage": "journal"}')
+    (cli.data_dir / "todos.journal").mkdir()  # Appending to it fails
+    code, out, err = cli(flag, "add", "Buy milk")
+    assert code == 1
+    if flag == "--json":
+        result = json.loads(out)
+        assert not result["ok"] and result["error"].startswith("Could not save todos")
+    else:
+        assert "ghosty: Could not save todos" in err